@@ -1,10 +1,17 @@
+import importlib
+
 from .config import Config, get_config
-from .fetcher import GitHubFetcher
-from .filter import RepositoryFilter
-from .llm import LLMSummarizer
-from .emailer import EmailSender
-from .scheduler import Scheduler
-from .models import Repository, TrendingReport
+
+# Heavier submodules (requests, smtplib, SQLAlchemy, APScheduler) load on first access
+_LAZY_ATTRS = {
+    'GitHubFetcher': 'src.fetcher',
+    'RepositoryFilter': 'src.filter',
+    'LLMSummarizer': 'src.llm',
+    'EmailSender': 'src.emailer',
+    'Scheduler': 'src.scheduler',
+    'Repository': 'src.models',
+    'TrendingReport': 'src.models',
+}
 
 __all__ = [
     'Config', 'get_config',
@@ -15,3 +22,16 @@ __all__ = [
     'Scheduler',
     'Repository', 'TrendingReport'
 ]
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
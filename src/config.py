@@ -1,10 +1,18 @@
 import os
+import re
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 import yaml
 from pydantic import BaseModel, model_validator
 
+try:
+    from yaml import CSafeDumper as _SafeDumper, CSafeLoader as _SafeLoader
+except ImportError:
+    # PyYAML built without libyaml
+    from yaml import SafeDumper as _SafeDumper, SafeLoader as _SafeLoader
+
 try:
     from dotenv import load_dotenv
     load_dotenv()
@@ -36,6 +44,9 @@ class LLMConfig(BaseModel):
     max_tokens: int = 200
     temperature: float = 0.5
     summary_prompt: str = ""
+    cache_ttl_days: int = 7
+    concurrency: int = 8
+    batch_size: int = 1
 
 
 class SMTPConfig(BaseModel):
@@ -53,6 +64,7 @@ class EmailConfig(BaseModel):
     from_address: str = ""
     to_addresses: List[str] = []
     subject: str = "Daily GitHub Trending - New Repositories"
+    use_bcc: bool = False  # Send one message with all recipients as BCC
 
     @model_validator(mode='after')
     def infer_from_address(self):
@@ -77,22 +89,24 @@ class Config(BaseModel):
     scheduler: SchedulerConfig = SchedulerConfig()
 
 
+# ${KEY}, ${KEY:-default} or ${KEY:=default}
+_ENV_VAR_RE = re.compile(r'\$\{([^}:]+)(?::[-=]([^}]*))?\}')
+
+
+def _substitute_env_var(match: re.Match) -> str:
+    env_key, default_value = match.group(1), match.group(2)
+    if default_value is None:
+        # No default value
+        return os.getenv(env_key, "")
+    default_value = default_value.strip().strip('"').strip("'")
+    return os.getenv(env_key, default_value)
+
+
 def _replace_env_vars(value: Any) -> Any:
-    if isinstance(value, str) and value.startswith("${") and value.endswith("}"):
-        env_spec = value[2:-1]  # Remove ${ and }
-
-        # Check for default value syntax: KEY:-default_value or KEY:=default_value
-        if ":-" in env_spec:
-            env_key, default_value = env_spec.split(":-", 1)
-            default_value = default_value.strip().strip('"').strip("'")
-            return os.getenv(env_key, default_value)
-        elif ":=" in env_spec:
-            env_key, default_value = env_spec.split(":=", 1)
-            default_value = default_value.strip().strip('"').strip("'")
-            return os.getenv(env_key, default_value)
-        else:
-            # No default value
-            return os.getenv(env_spec, "")
+    if isinstance(value, str):
+        if "${" not in value:
+            return value
+        return _ENV_VAR_RE.sub(_substitute_env_var, value)
     elif isinstance(value, dict):
         return {k: _replace_env_vars(v) for k, v in value.items()}
     elif isinstance(value, list):
@@ -102,7 +116,7 @@ def _replace_env_vars(value: Any) -> Any:
 
 def load_yaml_config(config_path: str) -> Dict[str, Any]:
     with open(config_path, 'r', encoding='utf-8') as f:
-        config_data = yaml.safe_load(f)
+        config_data = yaml.load(f, Loader=_SafeLoader)
 
     if not config_data:
         return {}
@@ -122,19 +136,28 @@ def load_yaml_config(config_path: str) -> Dict[str, Any]:
     return config_data
 
 
+@lru_cache(maxsize=8)
+def _load_config_cached(config_path: str, mtime_ns: int, size: int) -> Config:
+    """Parse and validate a config file; the stat fields only serve as cache key."""
+    return Config(**load_yaml_config(config_path))
+
+
 def get_config(config_path: Optional[str] = None) -> Config:
     if config_path is None:
         config_path = os.getenv('CONFIG_PATH', 'config.yaml')
 
     config_file = Path(config_path)
-    if config_file.exists():
-        config_data = load_yaml_config(str(config_file))
-        return Config(**config_data)
-    else:
+    try:
+        stat = config_file.stat()
+    except OSError:
         return Config()
 
+    # Re-parse only when the file changes; hand out a copy so callers can't mutate the cache
+    config = _load_config_cached(str(config_file.resolve()), stat.st_mtime_ns, stat.st_size)
+    return config.model_copy(deep=True)
+
 
 def save_config(config: Config, config_path: str = 'config.yaml') -> None:
     config_dict = config.model_dump()
     with open(config_path, 'w', encoding='utf-8') as f:
-        yaml.dump(config_dict, f, allow_unicode=True, default_flow_style=False)
+        yaml.dump(config_dict, f, Dumper=_SafeDumper, allow_unicode=True, default_flow_style=False)
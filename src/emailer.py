@@ -1,24 +1,121 @@
 import logging
+import re
 import smtplib
+import string
 from datetime import datetime, timezone
 from email.mime.multipart import MIMEMultipart
+from email.policy import SMTP as SMTP_POLICY
 from email.mime.text import MIMEText
 from pathlib import Path
-from typing import List, Optional
+from typing import Iterable, Iterator, NamedTuple, Optional, Sequence, Tuple, Union
 
 from src.config import Config
 from src.models import RepositorySummary, TrendingReport
 
 logger = logging.getLogger(__name__)
 
+# HTML escaping for user-controlled text, done by str.translate in a single C pass
+_HTML_ESCAPE = str.maketrans({
+    '&': '&amp;',
+    '<': '&lt;',
+    '>': '&gt;',
+    '"': '&quot;',
+    "'": '&#x27;',
+})
+
+# Summary separators become <hr>, remaining newlines become <br>, in a single pass
+_SUMMARY_BREAK_RE = re.compile(r'\n---\n|\n')
+_SUMMARY_HR = '<hr style="border: 0; border-top: 1px solid #e1e4e8; margin: 12px 0;">'
+
+
+def _summary_break(match: re.Match) -> str:
+    return _SUMMARY_HR if match.group(0) != '\n' else '<br>'
+
+
+class ReportDates(NamedTuple):
+    """Report timestamps formatted once and shared by the subject, body and filename"""
+    date: str
+    timestamp: str
+    display: str
+
+    @classmethod
+    def from_report(cls, report: TrendingReport) -> "ReportDates":
+        generated_at = report.generated_at
+        return cls(
+            date=generated_at.strftime("%Y-%m-%d"),
+            timestamp=generated_at.strftime("%Y%m%d_%H%M%S"),
+            display=generated_at.strftime("%Y-%m-%d %H:%M")
+        )
+
 
 class EmailSender:
+    # Reconnect after this many messages on one SMTP session
+    MAX_EMAILS_PER_CONNECTION = 100
+
+    # Per-repository block of the HTML report
+    _REPO_TEMPLATE = string.Template("""
+            <div style="border: 1px solid #ddd; padding: 15px; margin-bottom: 15px; border-radius: 5px;">
+                <div style="margin-bottom: 8px;">
+                    <strong>#$index</strong>
+                    <a href="$url" style="color: #0366d6; text-decoration: none; margin-left: 10px;">
+                        $full_name
+                    </a>
+                    <span style="background: #e1e4e8; padding: 2px 6px; border-radius: 3px; font-size: 11px; margin-left: 10px;">
+                        $language
+                    </span>
+                </div>
+                <div style="margin: 8px 0; color: #586069; line-height: 1.6;">$summary</div>
+            </div>
+            """)
+
     def __init__(self, config: Optional[Config] = None):
         self.config = config or Config()
         self.email_config = self.config.email
 
-    def send_report(self, report: TrendingReport) -> bool:
+    def send_report(self, report: TrendingReport, use_bcc: Optional[bool] = None) -> bool:
         """Send report via email using simplified HTML to avoid spam filters"""
+        if not self._can_send():
+            return False
+
+        subject, html_content, text_content = self._prepare_report(report)
+        return self.send_content(subject, html_content, text_content, use_bcc=use_bcc)
+
+    def send_content(
+        self,
+        subject: str,
+        html_content: str,
+        text_content: str,
+        use_bcc: Optional[bool] = None
+    ) -> bool:
+        """Send an already rendered message to all configured recipients over one SMTP session
+
+        use_bcc overrides email.use_bcc for this message.
+        """
+        if not self._can_send():
+            return False
+
+        recipients = tuple(self.email_config.to_addresses)
+
+        if self.email_config.use_bcc if use_bcc is None else use_bcc:
+            return self._send_bcc(
+                recipients=recipients,
+                subject=subject,
+                html_content=html_content,
+                text_content=text_content
+            )
+
+        return self._send_to_recipients(
+            recipients=recipients,
+            subject=subject,
+            html_content=html_content,
+            text_content=text_content
+        )
+
+    def send_report_bulk(self, report: TrendingReport) -> bool:
+        """Send report in a single SMTP transaction with all recipients as BCC"""
+        return self.send_report(report, use_bcc=True)
+
+    def _can_send(self) -> bool:
         if not self.email_config.enabled:
             logger.info("Email sending is disabled")
             return False
@@ -27,36 +124,122 @@ class EmailSender:
             logger.warning("No recipient addresses configured. Skipping email sending.")
             return False
 
-        # Generate simplified HTML report
-        html_content = self._generate_html_report(report)
-        text_content = self._generate_text_report(report)
+        return True
+
+    def _prepare_report(self, report: TrendingReport) -> Tuple[str, str, str]:
+        """Render the report, save the HTML copy and return (subject, html, text)."""
+        dates = ReportDates.from_report(report)
+
+        # Generate simplified HTML report; the chunks are written to disk as-is
+        # and joined only once for the email body
+        html_chunks = list(self._iter_html_report(report, dates))
+        text_content = self._generate_text_report(report, dates)
 
-        # Save HTML to file before sending
-        self._save_html_report(html_content, report)
+        # Save HTML (and a JSON archive of the report) to file before sending
+        self._save_html_report(html_chunks, report, dates)
+        self._save_json_report(report, dates)
 
-        subject = self._generate_subject(report)
+        html_content = "".join(html_chunks)
+
+        subject = self._generate_subject(report, dates)
 
         logger.info(f"Attempting to send email to {len(self.email_config.to_addresses)} recipients")
         logger.info(f"HTML content length: {len(html_content)} characters (simplified to avoid spam filters)")
 
+        return subject, html_content, text_content
+
+    def _send_to_recipients(
+        self,
+        recipients: Sequence[str],
+        subject: str,
+        html_content: str,
+        text_content: str
+    ) -> bool:
+        """Send one message to each recipient over a shared SMTP connection."""
+        from_address = self._extract_email_address(self.email_config.from_address)
+
+        # Serialize the MIME body once; only the To: header differs per recipient
+        msg = self._build_message(subject, html_content, text_content)
+        del msg["To"]
+        payload = msg.as_bytes(policy=SMTP_POLICY)
+
         success = True
-        for recipient in self.email_config.to_addresses:
-            try:
-                self._send_email(
-                    to_addr=recipient,
-                    subject=subject,
-                    html_content=html_content,
-                    text_content=text_content
-                )
-                logger.info(f"Email sent successfully to {recipient}")
-            except Exception as e:
-                logger.error(f"Failed to send email to {recipient}: {e}", exc_info=True)
-                success = False
+        server = None
+        sent_on_connection = 0
+        try:
+            for recipient in recipients:
+                # Rotate the connection periodically so long lists don't hit server-side limits
+                if server is not None and sent_on_connection >= self.MAX_EMAILS_PER_CONNECTION:
+                    self._close_smtp(server)
+                    server = None
+
+                try:
+                    to_header = SMTP_POLICY.header_factory("To", recipient).fold(policy=SMTP_POLICY)
+                    data = to_header.encode("ascii") + payload
+                    if server is None:
+                        server = self._open_smtp()
+                        sent_on_connection = 0
+                    try:
+                        server.sendmail(from_address, [recipient], data)
+                    except smtplib.SMTPServerDisconnected:
+                        # Reconnect once and retry on a dropped session
+                        logger.warning(f"SMTP connection lost, reconnecting to send to {recipient}")
+                        self._close_smtp(server)
+                        server = None
+                        server = self._open_smtp()
+                        sent_on_connection = 0
+                        server.sendmail(from_address, [recipient], data)
+                    sent_on_connection += 1
+                    logger.info(f"Email sent successfully to {recipient}")
+                except smtplib.SMTPRecipientsRefused as e:
+                    # Only this address was rejected; the session is still usable
+                    logger.error(f"Failed to send email to {recipient}: {e.recipients}")
+                    success = False
+                except Exception as e:
+                    # Any other SMTP/socket error may leave the session in an unknown state, so the
+                    # next recipient starts on a fresh connection
+                    logger.error(f"Failed to send email to {recipient}: {e}", exc_info=True)
+                    success = False
+                    self._close_smtp(server)
+                    server = None
+        finally:
+            self._close_smtp(server)
 
         return success
 
-    def _generate_subject(self, report: TrendingReport) -> str:
-        date_str = report.generated_at.strftime("%Y-%m-%d")
+    def _send_bcc(
+        self,
+        recipients: Sequence[str],
+        subject: str,
+        html_content: str,
+        text_content: str
+    ) -> bool:
+        """Upload the message once and let the server fan it out to every recipient."""
+        from_address = self._extract_email_address(self.email_config.from_address)
+        msg = self._build_message(subject, html_content, text_content, "undisclosed-recipients:;")
+
+        server = None
+        try:
+            server = self._open_smtp()
+            refused = server.send_message(msg, from_addr=from_address, to_addrs=list(recipients))
+        except smtplib.SMTPRecipientsRefused as e:
+            refused = e.recipients
+        except Exception as e:
+            logger.error(f"Failed to send email to {len(recipients)} recipients: {e}", exc_info=True)
+            return False
+        finally:
+            self._close_smtp(server)
+
+        for recipient in recipients:
+            if recipient in refused:
+                logger.error(f"Failed to send email to {recipient}: {refused[recipient]}")
+            else:
+                logger.info(f"Email sent successfully to {recipient}")
+
+        return not refused
+
+    def _generate_subject(self, report: TrendingReport, dates: Optional[ReportDates] = None) -> str:
+        date_str = (dates or ReportDates.from_report(report)).date
         new_count = report.new_repos_count
 
         if self.email_config.subject:
@@ -64,7 +247,12 @@ class EmailSender:
 
         return f"GitHub Trending - {date_str} - {new_count} new repositories"
 
-    def _save_html_report(self, html_content: str, report: TrendingReport) -> None:
+    def _save_html_report(
+        self,
+        html_content: Union[str, Iterable[str]],
+        report: TrendingReport,
+        dates: Optional[ReportDates] = None
+    ) -> None:
         """Save HTML report to file before sending email."""
         try:
             # Create reports directory
@@ -72,48 +260,46 @@ class EmailSender:
             reports_dir.mkdir(parents=True, exist_ok=True)
 
             # Generate filename with timestamp
-            timestamp = report.generated_at.strftime("%Y%m%d_%H%M%S")
+            timestamp = (dates or ReportDates.from_report(report)).timestamp
             filename = reports_dir / f"trending_report_{timestamp}.html"
 
-            # Save HTML content to file
+            # Save HTML content to file, chunk by chunk when given an iterable
+            if isinstance(html_content, str):
+                html_content = (html_content,)
             with open(filename, 'w', encoding='utf-8') as f:
-                f.write(html_content)
+                f.writelines(html_content)
 
             logger.info(f"HTML report saved to: {filename}")
 
         except Exception as e:
             logger.error(f"Failed to save HTML report: {e}")
 
-    def _generate_html_report(self, report: TrendingReport) -> str:
-        """Generate simplified HTML report for email (avoid spam filters)"""
-        repos_html = ""
-        # Show ALL repositories (removed the 5 repo limit)
-        all_repos = report.repositories
+    def _save_json_report(self, report: TrendingReport, dates: Optional[ReportDates] = None) -> None:
+        """Archive the report as JSON using Pydantic's native serializer."""
+        try:
+            reports_dir = Path("data/reports")
+            reports_dir.mkdir(parents=True, exist_ok=True)
 
-        for i, repo_summary in enumerate(all_repos, 1):
-            repo = repo_summary.repository
+            timestamp = (dates or ReportDates.from_report(report)).timestamp
+            filename = reports_dir / f"trending_report_{timestamp}.json"
 
-            # Process summary - convert newlines to breaks and separators to HR tags
-            # Remove extra <br> tags around HR to eliminate spacing
-            summary_html = repo_summary.summary.replace('\n---\n', '<hr style="border: 0; border-top: 1px solid #e1e4e8; margin: 12px 0;">')
-            summary_html = summary_html.replace('\n', '<br>')
+            # model_dump_json serializes straight to JSON without building an intermediate dict
+            filename.write_text(report.model_dump_json(), encoding='utf-8')
 
-            repos_html += f"""
-            <div style="border: 1px solid #ddd; padding: 15px; margin-bottom: 15px; border-radius: 5px;">
-                <div style="margin-bottom: 8px;">
-                    <strong>#{i}</strong>
-                    <a href="{repo.html_url}" style="color: #0366d6; text-decoration: none; margin-left: 10px;">
-                        {repo.full_name}
-                    </a>
-                    <span style="background: #e1e4e8; padding: 2px 6px; border-radius: 3px; font-size: 11px; margin-left: 10px;">
-                        {repo.language or 'Unknown'}
-                    </span>
-                </div>
-                <div style="margin: 8px 0; color: #586069; line-height: 1.6;">{summary_html}</div>
-            </div>
-            """
+            logger.info(f"JSON report saved to: {filename}")
+
+        except Exception as e:
+            logger.error(f"Failed to save JSON report: {e}")
+
+    def _generate_html_report(self, report: TrendingReport, dates: Optional[ReportDates] = None) -> str:
+        """Generate simplified HTML report for email (avoid spam filters)"""
+        return "".join(self._iter_html_report(report, dates))
+
+    def _iter_html_report(self, report: TrendingReport, dates: Optional[ReportDates] = None) -> Iterator[str]:
+        """Yield the HTML report in chunks: header, one block per repository, footer."""
+        dates = dates or ReportDates.from_report(report)
 
-        html = f"""
+        yield f"""
         <!DOCTYPE html>
         <html>
         <head>
@@ -123,7 +309,7 @@ class EmailSender:
             <div style="background: #0366d6; color: white; padding: 20px; border-radius: 5px; margin-bottom: 20px;">
                 <h1 style="margin: 0; font-size: 20px;">GitHub Trending Report</h1>
                 <p style="margin: 10px 0 0 0; font-size: 14px;">
-                    {report.generated_at.strftime('%Y-%m-%d %H:%M')} | Period: {report.period} | {report.language or 'All Languages'}
+                    {dates.display} | Period: {report.period} | {report.language or 'All Languages'}
                 </p>
             </div>
 
@@ -138,7 +324,28 @@ class EmailSender:
                 </div>
             </div>
 
-            {repos_html}
+            """
+
+        # Show ALL repositories (removed the 5 repo limit)
+        for i, repo_summary in enumerate(report.repositories, 1):
+            repo = repo_summary.repository
+
+            # Process summary - convert newlines to breaks and separators to HR tags
+            # Remove extra <br> tags around HR to eliminate spacing
+            summary_html = _SUMMARY_BREAK_RE.sub(
+                _summary_break,
+                repo_summary.summary.translate(_HTML_ESCAPE)
+            )
+
+            yield self._REPO_TEMPLATE.substitute(
+                index=i,
+                url=repo.html_url.translate(_HTML_ESCAPE),
+                full_name=repo.full_name.translate(_HTML_ESCAPE),
+                language=(repo.language or 'Unknown').translate(_HTML_ESCAPE),
+                summary=summary_html
+            )
+
+        yield f"""
 
             <div style="text-align: center; margin-top: 30px; padding-top: 20px; border-top: 1px solid #e1e4e8; font-size: 12px; color: #666;">
                 <p>Generated by GitHub Trending Agent</p>
@@ -148,11 +355,10 @@ class EmailSender:
         </html>
         """
 
-        return html
-
-    def _generate_text_report(self, report: TrendingReport) -> str:
+    def _generate_text_report(self, report: TrendingReport, dates: Optional[ReportDates] = None) -> str:
+        dates = dates or ReportDates.from_report(report)
         lines = [
-            f"GitHub Trending Report - {report.generated_at.strftime('%Y-%m-%d')}",
+            f"GitHub Trending Report - {dates.date}",
             f"Period: {report.period} | Language: {report.language or 'All'}",
             f"Total: {report.total_repos_count} | New: {report.new_repos_count}",
             "",
@@ -184,50 +390,87 @@ class EmailSender:
             return from_address.split("<")[1].split(">")[0]
         return from_address
 
-    def _send_email(
+    def _build_message(
         self,
-        to_addr: str,
         subject: str,
         html_content: str,
-        text_content: str
-    ) -> None:
-        msg = MIMEMultipart("alternative")
+        text_content: str,
+        to_addr: str = ""
+    ) -> MIMEMultipart:
+        # SMTP policy from the start so non-ASCII Subject/From are RFC 2047-encoded when serialized
+        msg = MIMEMultipart("alternative", policy=SMTP_POLICY)
         msg["Subject"] = subject
         msg["From"] = self.email_config.from_address
         msg["To"] = to_addr
         msg["List-Unsubscribe"] = "<>"
 
-        part1 = MIMEText(text_content, "plain", _charset="utf-8")
-        part2 = MIMEText(html_content, "html", _charset="utf-8")
+        part1 = MIMEText(text_content, "plain", _charset="utf-8", policy=SMTP_POLICY)
+        part2 = MIMEText(html_content, "html", _charset="utf-8", policy=SMTP_POLICY)
 
         msg.attach(part1)
         msg.attach(part2)
 
+        return msg
+
+    def _open_smtp(self) -> smtplib.SMTP:
+        """Open an SMTP connection with STARTTLS/SSL and login already done."""
+        # Read the settings once instead of going through the Pydantic model on every use
         smtp_config = self.email_config.smtp
+        host, port = smtp_config.host, smtp_config.port
+        username, password = smtp_config.username, smtp_config.password
+        use_ssl = smtp_config.use_ssl or port == 465
+        use_tls = smtp_config.use_tls
 
-        logger.info(f"Connecting to SMTP server: {smtp_config.host}:{smtp_config.port}")
+        logger.info(f"Connecting to SMTP server: {host}:{port}")
         logger.info(f"From address: {self.email_config.from_address}")
-        logger.info(f"SMTP username: {smtp_config.username}")
-
-        # Extract email address from from_address if it contains a name
-        from_address = self._extract_email_address(self.email_config.from_address)
-        logger.info(f"Using from address for MAIL FROM: {from_address}")
+        logger.info(f"SMTP username: {username}")
 
         # Use SMTP_SSL for port 465, otherwise use SMTP with optional STARTTLS
-        if smtp_config.use_ssl or smtp_config.port == 465:
+        if use_ssl:
             logger.info("Using SMTP_SSL connection")
-            with smtplib.SMTP_SSL(smtp_config.host, smtp_config.port, timeout=30) as server:
-                server.login(smtp_config.username, smtp_config.password)
-                server.send_message(msg)
-                logger.info("Email sent via SMTP_SSL")
+            server = smtplib.SMTP_SSL(host, port, timeout=30)
         else:
             logger.info("Using SMTP connection with STARTTLS")
-            with smtplib.SMTP(smtp_config.host, smtp_config.port, timeout=30) as server:
-                if smtp_config.use_tls:
-                    server.starttls()
-                server.login(smtp_config.username, smtp_config.password)
-                server.send_message(msg)
-                logger.info("Email sent via SMTP with STARTTLS")
+            server = smtplib.SMTP(host, port, timeout=30)
+
+        try:
+            if not use_ssl and use_tls:
+                server.starttls()
+            server.login(username, password)
+        except Exception:
+            self._close_smtp(server)
+            raise
+
+        return server
+
+    @staticmethod
+    def _close_smtp(server: Optional[smtplib.SMTP]) -> None:
+        if server is None:
+            return
+        try:
+            server.quit()
+        except Exception:
+            server.close()
+
+    def _send_email(
+        self,
+        to_addr: str,
+        subject: str,
+        html_content: str,
+        text_content: str
+    ) -> None:
+        msg = self._build_message(subject, html_content, text_content, to_addr)
+
+        # Extract email address from from_address if it contains a name
+        from_address = self._extract_email_address(self.email_config.from_address)
+        logger.info(f"Using from address for MAIL FROM: {from_address}")
+
+        server = self._open_smtp()
+        try:
+            server.send_message(msg, from_addr=from_address, to_addrs=[to_addr])
+            logger.info("Email sent")
+        finally:
+            self._close_smtp(server)
 
     def test_connection(self) -> bool:
         try:
@@ -1,23 +1,56 @@
 import base64
 import logging
-import time
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Iterator, List, Optional, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from src.config import Config
 from src.models import Repository
+from src.readme_cache import ReadmeCache, ResponseCache
 from src.trending_scraper import GitHubTrendingScraper
 
 logger = logging.getLogger(__name__)
 
 
+def _decode_readme(content: str) -> str:
+    """Decode base64 README content"""
+    return base64.b64decode(content).decode("utf-8", errors="ignore")
+
+
 class GitHubFetcher:
     """GitHub Trending data fetcher - fetches data through web scraping only"""
 
-    def __init__(self, config: Optional[Config] = None):
+    # Concurrent README fetches
+    README_MAX_WORKERS = 16
+    # Maximum retry attempts per API request
+    MAX_RETRIES = 3
+    # Exponential backoff factor in seconds
+    RETRY_BACKOFF = 1
+
+    def __init__(self, config: Optional[Config] = None, readme_cache: Optional[ReadmeCache] = None):
         self.config = config or Config()
+        self.readme_cache = readme_cache or ReadmeCache()
         self.session = requests.Session()
+        # Retry rate limits and transient errors with exponential backoff (honors Retry-After),
+        # with enough pooled keep-alive connections for every README worker
+        retry = Retry(
+            total=self.MAX_RETRIES,
+            backoff_factor=self.RETRY_BACKOFF,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=["GET"],
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(
+            max_retries=retry,
+            pool_connections=self.README_MAX_WORKERS,
+            pool_maxsize=self.README_MAX_WORKERS
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
         self.session.headers.update({
             "Accept": "application/vnd.github.v3+json",
             "User-Agent": "GitHub-Trending-Agent"
@@ -27,7 +60,8 @@ class GitHubFetcher:
             self.session.headers["Authorization"] = f"Bearer {self.config.github.token}"
         else:
             logger.warning("No GitHub token provided. Limited API access.")
-        self.session.timeout = self.config.github.timeout
+        # Kept for the fetcher's lifetime so the trending-page connection stays warm
+        self.scraper = GitHubTrendingScraper(response_cache=ResponseCache())
 
     def fetch_trending_repos(
         self,
@@ -54,8 +88,7 @@ class GitHubFetcher:
 
         logger.info(f"Fetching trending repos: period={period}, language={language or 'All'}, limit={limit}")
 
-        scraper = GitHubTrendingScraper()
-        repos = scraper.scrape_trending(
+        repos = self.scraper.scrape_trending(
             period=period,
             language=language,
             limit=limit,
@@ -66,6 +99,11 @@ class GitHubFetcher:
 
         return repos
 
+    def close(self) -> None:
+        """Close pooled HTTP connections"""
+        self.session.close()
+        self.scraper.session.close()
+
     def fetch_repo_readme(self, repo_full_name: str) -> Optional[str]:
         """
         Fetch repository README content
@@ -76,40 +114,31 @@ class GitHubFetcher:
         Returns:
             README content, returns None on failure
         """
-        max_retries = 3
-        retry_delay = 2  # seconds
-
-        for attempt in range(max_retries):
-            try:
-                readme_url = f"{self.config.github.base_url}/repos/{repo_full_name}/readme"
-                response = self.session.get(readme_url)
-
-                # Handle rate limiting
-                if response.status_code == 403:
-                    if 'Retry-After' in response.headers:
-                        retry_after = int(response.headers['Retry-After'])
-                        logger.warning(f"Rate limit exceeded. Retrying after {retry_after} seconds...")
-                        time.sleep(retry_after)
-                        continue
-                    elif attempt < max_retries - 1:
-                        logger.warning(f"Rate limit exceeded. Retrying in {retry_delay} seconds...")
-                        time.sleep(retry_delay)
-                        retry_delay *= 2  # Exponential backoff
-                        continue
-
-                response.raise_for_status()
-                data = response.json()
-                content = data.get("content", "")
-                return base64.b64decode(content).decode("utf-8", errors="ignore")
-            except requests.RequestException as e:
-                if attempt == max_retries - 1:  # Last attempt
-                    logger.warning(f"Failed to fetch README for {repo_full_name}: {e}")
-                    return None
-                # Retry on other errors too
-                logger.warning(f"Attempt {attempt + 1} failed for {repo_full_name}, retrying...")
-                time.sleep(retry_delay)
-                retry_delay *= 2
-        return None
+        readme_url = f"{self.config.github.base_url}/repos/{repo_full_name}/readme"
+
+        # Revalidate a cached copy with If-None-Match; a 304 costs no body or decode
+        cached = self.readme_cache.get(repo_full_name)
+        headers = {"If-None-Match": cached[0]} if cached else None
+
+        try:
+            # Retries and backoff are handled by the session's HTTPAdapter
+            response = self.session.get(readme_url, headers=headers, timeout=self.config.github.timeout)
+            if cached and response.status_code == 304:
+                logger.debug(f"README for {repo_full_name} not modified, using cache")
+                return cached[1]
+            response.raise_for_status()
+            data = response.json()
+        except requests.RequestException as e:
+            logger.warning(f"Failed to fetch README for {repo_full_name}: {e}")
+            return None
+
+        readme = _decode_readme(data.get("content", ""))
+
+        etag = response.headers.get("ETag")
+        if etag:
+            self.readme_cache.put(repo_full_name, etag, readme)
+
+        return readme
 
     def enrich_repository(self, repo: Repository) -> Repository:
         """
@@ -125,3 +154,43 @@ class GitHubFetcher:
         # Use object.__setattr__ to bypass Pydantic field validation
         object.__setattr__(repo, 'readme_content', readme)
         return repo
+
+    def enrich_repositories(self, repos: List[Repository]) -> List[Repository]:
+        """
+        Enrich repositories concurrently (fetch READMEs in a thread pool)
+
+        Args:
+            repos: Repository list
+
+        Returns:
+            Enriched repository list, in the same order
+        """
+        if not repos:
+            return []
+
+        workers = min(self.README_MAX_WORKERS, len(repos))
+        logger.info(f"Fetching READMEs for {len(repos)} repositories ({workers} workers)...")
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(self.enrich_repository, repos))
+
+    def iter_enriched(self, repos: List[Repository]) -> Iterator[Tuple[int, Repository]]:
+        """
+        Enrich repositories concurrently, yielding each one as soon as its README arrives
+
+        Args:
+            repos: Repository list
+
+        Returns:
+            Iterator of (index in repos, enriched repository), in completion order
+        """
+        if not repos:
+            return
+
+        workers = min(self.README_MAX_WORKERS, len(repos))
+        logger.info(f"Fetching READMEs for {len(repos)} repositories ({workers} workers)...")
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(self.enrich_repository, repo): index for index, repo in enumerate(repos)}
+            for future in as_completed(futures):
+                yield futures[future], future.result()
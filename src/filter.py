@@ -1,9 +1,11 @@
 import logging
 import os
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Set
+from typing import Dict, Iterator, List, Optional
 
-from sqlalchemy import Column, DateTime, Integer, String, Text, create_engine
+from sqlalchemy import Column, DateTime, Index, Integer, String, Text, case, create_engine, delete, event, func, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session, declarative_base, sessionmaker
 
 from src.config import Config
@@ -13,9 +15,23 @@ logger = logging.getLogger(__name__)
 
 Base = declarative_base()
 
+DEFAULT_DB_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)),
+    "data",
+    "repos.db"
+)
+
 
 class RepositoryRecord(Base):
     __tablename__ = "repositories"
+    __table_args__ = (
+        # get_recent_repos / cleanup_old_records
+        Index("ix_repos_last_seen", "last_seen_at"),
+        # get_trending_repos ordering (SQLite walks it backwards for DESC)
+        Index("ix_repos_trending", "appearance_count", "stars"),
+        # first_seen_at lookups
+        Index("ix_repos_first_seen", "first_seen_at"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     name = Column(String(255), nullable=False, index=True)
@@ -38,7 +54,7 @@ class RepositoryRecord(Base):
     appearance_count = Column(Integer, default=1)
 
     def to_model(self) -> Repository:
-        return Repository(
+        return Repository.model_construct(
             name=self.name,
             full_name=self.full_name,
             description=self.description,
@@ -59,72 +75,123 @@ class RepositoryRecord(Base):
             appearance_count=self.appearance_count
         )
 
+    @staticmethod
+    def row_from_model(repo: Repository) -> Dict[str, object]:
+        """Column values for a repository, usable for bulk INSERT statements"""
+        return {
+            "name": repo.name,
+            "full_name": repo.full_name,
+            "description": repo.description,
+            "html_url": repo.html_url,
+            "language": repo.language,
+            "stars": repo.stars,
+            "forks": repo.forks,
+            "watchers": repo.watchers,
+            "open_issues": repo.open_issues,
+            "owner_login": repo.owner_login,
+            "owner_avatar_url": repo.owner_avatar_url,
+            "created_at": repo.created_at,
+            "updated_at": repo.updated_at,
+            "pushed_at": repo.pushed_at,
+            "readme_content": repo.readme_content,
+            "first_seen_at": repo.first_seen_at,
+            "last_seen_at": repo.last_seen_at,
+            "appearance_count": repo.appearance_count
+        }
+
     @classmethod
     def from_model(cls, repo: Repository) -> "RepositoryRecord":
-        return cls(
-            name=repo.name,
-            full_name=repo.full_name,
-            description=repo.description,
-            html_url=repo.html_url,
-            language=repo.language,
-            stars=repo.stars,
-            forks=repo.forks,
-            watchers=repo.watchers,
-            open_issues=repo.open_issues,
-            owner_login=repo.owner_login,
-            owner_avatar_url=repo.owner_avatar_url,
-            created_at=repo.created_at,
-            updated_at=repo.updated_at,
-            pushed_at=repo.pushed_at,
-            readme_content=repo.readme_content,
-            first_seen_at=repo.first_seen_at,
-            last_seen_at=repo.last_seen_at,
-            appearance_count=repo.appearance_count
-        )
+        return cls(**cls.row_from_model(repo))
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """WAL journal with NORMAL sync (fewer fsyncs per commit) and larger in-memory caches"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA mmap_size=268435456")  # 256MB
+    cursor.execute("PRAGMA cache_size=-65536")  # 64MB
+    cursor.close()
 
 
 class RepositoryFilter:
+    LOOKUP_CHUNK_SIZE = 500
+
     def __init__(self, config: Optional[Config] = None, db_path: Optional[str] = None):
         self.config = config or Config()
-        self.db_path = db_path or os.path.join(
-            os.path.dirname(os.path.dirname(__file__)),
-            "data",
-            "repos.db"
-        )
+        self.db_path = db_path or DEFAULT_DB_PATH
         self._engine = None
         self._session_factory = None
+        # full_name -> first_seen_at, populated while a begin_batch() block is active
+        self._known: Optional[Dict[str, datetime]] = None
 
     @property
     def engine(self):
         if self._engine is None:
             os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
-            self._engine = create_engine(f"sqlite:///{self.db_path}", echo=False)
+            self._engine = create_engine(
+                f"sqlite:///{self.db_path}",
+                echo=False,
+                insertmanyvalues_page_size=500
+            )
+            event.listen(self._engine, "connect", _set_sqlite_pragmas)
         return self._engine
 
     @property
     def session_factory(self):
         if self._session_factory is None:
             Base.metadata.create_all(self.engine)
-            self._session_factory = sessionmaker(bind=self.engine)
+            # create_all skips existing tables, so add indexes missing from older databases
+            for index in RepositoryRecord.__table__.indexes:
+                index.create(self.engine, checkfirst=True)
+            # Writes are Core statements, so ORM flush/expiry bookkeeping buys nothing
+            self._session_factory = sessionmaker(
+                bind=self.engine,
+                autoflush=False,
+                expire_on_commit=False
+            )
         return self._session_factory
 
     def get_session(self) -> Session:
         return self.session_factory()
 
+    @contextmanager
+    def begin_batch(self) -> Iterator["RepositoryFilter"]:
+        """Preload known repositories so is_new_repository() needs no query per call"""
+        with self.get_session() as session:
+            rows = session.execute(select(
+                RepositoryRecord.full_name,
+                RepositoryRecord.first_seen_at
+            )).all()
+        self._known = {row.full_name: row.first_seen_at for row in rows}
+        try:
+            yield self
+        finally:
+            self._known = None
+
     def is_new_repository(self, repo: Repository, days_threshold: Optional[int] = None) -> bool:
-        days = days_threshold or self.config.filter.days_threshold
-        threshold_date = datetime.now() - timedelta(days=days)
+        """Check a single repository; prefer filter_new_repos() or begin_batch() for many."""
+        if self._known is not None:
+            if repo.full_name not in self._known:
+                return True
+            repo.first_seen_at = self._known[repo.full_name]
+            return False
 
+        return self._lookup_one(repo)
+
+    def _lookup_one(self, repo: Repository) -> bool:
         with self.get_session() as session:
-            existing = session.query(RepositoryRecord).filter(
-                RepositoryRecord.full_name == repo.full_name
-            ).first()
+            first_seen_at = session.execute(
+                select(RepositoryRecord.first_seen_at).where(
+                    RepositoryRecord.full_name == repo.full_name
+                )
+            ).scalar_one_or_none()
 
-            if existing is None:
-                return True
-            else:
-                repo.first_seen_at = existing.first_seen_at
-                return False
+        if first_seen_at is None:
+            return True
+        repo.first_seen_at = first_seen_at
+        return False
 
     def filter_new_repos(
         self,
@@ -134,84 +201,142 @@ class RepositoryFilter:
         days = days_threshold or self.config.filter.days_threshold
         threshold_date = datetime.now() - timedelta(days=days)
 
+        names = list({repo.full_name for repo in repos})
+        existing = {}
+
         with self.get_session() as session:
-            existing_repos = session.query(RepositoryRecord.full_name).all()
-            existing_names = {r[0] for r in existing_repos}
-
-            new_repos = []
-            for repo in repos:
-                if repo.full_name not in existing_names:
-                    new_repos.append(repo)
-                    logger.info(f"New repository found: {repo.full_name}")
-                else:
-                    record = session.query(RepositoryRecord).filter(
-                        RepositoryRecord.full_name == repo.full_name
-                    ).first()
-                    if record:
-                        repo.first_seen_at = record.first_seen_at
-                        repo.appearance_count = record.appearance_count + 1
+            # Only the columns needed, for just these names, in IN-chunks under SQLite's parameter limit
+            for start in range(0, len(names), self.LOOKUP_CHUNK_SIZE):
+                rows = session.execute(select(
+                    RepositoryRecord.full_name,
+                    RepositoryRecord.first_seen_at,
+                    RepositoryRecord.appearance_count
+                ).where(RepositoryRecord.full_name.in_(names[start:start + self.LOOKUP_CHUNK_SIZE])))
+                existing.update({row.full_name: row for row in rows})
+
+        new_repos = []
+        for repo in repos:
+            hit = existing.get(repo.full_name)
+            if hit is None:
+                new_repos.append(repo)
+            else:
+                repo.first_seen_at = hit.first_seen_at
+                repo.appearance_count = hit.appearance_count + 1
+
+        # One aggregate line rather than a record per repository in the loop
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"New repositories: {', '.join(repo.full_name for repo in new_repos)}")
 
         return new_repos
 
     def save_repositories(self, repos: List[Repository]) -> None:
-        with self.get_session() as session:
-            for repo in repos:
-                existing = session.query(RepositoryRecord).filter(
-                    RepositoryRecord.full_name == repo.full_name
-                ).first()
-
-                if existing:
-                    existing.last_seen_at = repo.last_seen_at
-                    existing.stars = repo.stars
-                    existing.forks = repo.forks
-                    existing.appearance_count += 1
-                    if repo.readme_content and not existing.readme_content:
-                        existing.readme_content = repo.readme_content
-                else:
-                    record = RepositoryRecord.from_model(repo)
-                    session.add(record)
+        if not repos:
+            return
+
+        # Single upsert executed for all rows: new repos are inserted, known ones
+        # get their counters refreshed and keep any README already stored
+        stmt = sqlite_insert(RepositoryRecord)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[RepositoryRecord.full_name],
+            set_={
+                "last_seen_at": stmt.excluded.last_seen_at,
+                "stars": stmt.excluded.stars,
+                "forks": stmt.excluded.forks,
+                "appearance_count": RepositoryRecord.appearance_count + 1,
+                "readme_content": func.coalesce(
+                    func.nullif(RepositoryRecord.readme_content, ""),
+                    stmt.excluded.readme_content
+                ),
+            }
+        )
+        rows = [RepositoryRecord.row_from_model(repo) for repo in repos]
 
+        with self.get_session() as session:
+            session.execute(stmt, rows)
             session.commit()
 
-    def get_recent_repos(self, days: int = 7) -> List[Repository]:
+    @staticmethod
+    def _repository_columns(include_readme: bool, readme_chars: Optional[int] = None) -> list:
+        """Columns mapping onto Repository fields; README text only when asked for
+
+        With readme_chars set, SQLite truncates the README so the full text never
+        leaves the database.
+        """
+        columns = []
+        for column in RepositoryRecord.__table__.c:
+            if column.name == "id":
+                continue
+            if column.name == "readme_content":
+                if not include_readme:
+                    continue
+                if readme_chars is not None:
+                    column = func.substr(column, 1, readme_chars).label("readme_content")
+            columns.append(column)
+        return columns
+
+    @staticmethod
+    def _rows_to_models(rows) -> List[Repository]:
+        # Rows come from our own table, so skip Pydantic validation
+        return [Repository.model_construct(**row._mapping) for row in rows]
+
+    def get_recent_repos(
+        self,
+        days: int = 7,
+        include_readme: bool = True,
+        readme_chars: Optional[int] = None
+    ) -> List[Repository]:
         threshold_date = datetime.now() - timedelta(days=days)
 
+        stmt = select(*self._repository_columns(include_readme, readme_chars)).where(
+            RepositoryRecord.last_seen_at >= threshold_date
+        ).order_by(RepositoryRecord.last_seen_at.desc())
+
         with self.get_session() as session:
-            records = session.query(RepositoryRecord).filter(
-                RepositoryRecord.last_seen_at >= threshold_date
-            ).order_by(RepositoryRecord.last_seen_at.desc()).all()
+            return self._rows_to_models(session.execute(stmt))
 
-            return [r.to_model() for r in records]
+    def get_trending_repos(
+        self,
+        days: int = 30,
+        limit: int = 10,
+        include_readme: bool = True,
+        readme_chars: Optional[int] = None
+    ) -> List[Repository]:
+        stmt = select(*self._repository_columns(include_readme, readme_chars)).order_by(
+            RepositoryRecord.appearance_count.desc(),
+            RepositoryRecord.stars.desc()
+        ).limit(limit)
 
-    def get_trending_repos(self, days: int = 30, limit: int = 10) -> List[Repository]:
         with self.get_session() as session:
-            records = session.query(RepositoryRecord).order_by(
-                RepositoryRecord.appearance_count.desc(),
-                RepositoryRecord.stars.desc()
-            ).limit(limit).all()
-
-            return [r.to_model() for r in records]
+            return self._rows_to_models(session.execute(stmt))
 
     def cleanup_old_records(self, days: int = 90) -> int:
         threshold_date = datetime.now() - timedelta(days=days)
 
         with self.get_session() as session:
-            count = session.query(RepositoryRecord).filter(
-                RepositoryRecord.last_seen_at < threshold_date
-            ).delete()
+            # No ORM objects are loaded here, so skip identity-map synchronisation
+            count = session.execute(
+                delete(RepositoryRecord).where(
+                    RepositoryRecord.last_seen_at < threshold_date
+                ).execution_options(synchronize_session=False)
+            ).rowcount
             session.commit()
 
             logger.info(f"Cleaned up {count} old repository records")
             return count
 
     def get_statistics(self) -> Dict[str, int]:
+        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+
         with self.get_session() as session:
-            total = session.query(RepositoryRecord).count()
-            new_today = session.query(RepositoryRecord).filter(
-                RepositoryRecord.first_seen_at >= datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-            ).count()
+            # Both counts in a single pass over the table
+            total, new_today = session.execute(
+                select(
+                    func.count(),
+                    func.sum(case((RepositoryRecord.first_seen_at >= today, 1), else_=0))
+                ).select_from(RepositoryRecord)
+            ).one()
 
             return {
                 "total_repositories": total,
-                "new_today": new_today
+                "new_today": int(new_today or 0)
             }
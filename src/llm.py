@@ -1,23 +1,85 @@
+import hashlib
+import importlib.util
+import json
 import logging
-from typing import List, Optional
+import random
+import re
+import string
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 
 import httpx
 
 from src.config import Config, LLMConfig
+from src.llm_cache import SummaryCache
 from src.models import Repository
 
 logger = logging.getLogger(__name__)
 
+_SYSTEM_MESSAGE = {"role": "system", "content": "You are a helpful tech analyst assistant."}
+
+
+@lru_cache(maxsize=8)
+def _compile_prompt_template(template: str) -> Optional[Tuple[Tuple[str, Optional[str]], ...]]:
+    """Split a str.format template into (literal, field) pieces once
+
+    Returns None when the template uses format specs, conversions or attribute/index
+    access, in which case callers fall back to str.format.
+    """
+    pieces = []
+    for literal, field, format_spec, conversion in string.Formatter().parse(template):
+        if field is not None and (format_spec or conversion or not field.isidentifier()):
+            return None
+        pieces.append((literal, field))
+    return tuple(pieces)
+
+
+# HTTP/2 needs the optional h2 package (pip install httpx[http2])
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# First non-blank line that doesn't start with a markdown heading marker
+_FIRST_LINE_RE = re.compile(r"^(?!#)[^\S\n]*(\S[^\n]*)", re.M)
+# Outermost JSON array in a batched response (models sometimes wrap it in prose or code fences)
+_JSON_ARRAY_RE = re.compile(r"\[.*\]", re.S)
+
+_BATCH_PROMPT_HEADER = """You are a tech analyst. Summarize each of the following GitHub repositories in ONE concise sentence.
+Focus on what it does and why it's interesting.
+
+Respond with only a JSON array of objects like {"index": 1, "summary": "..."}, one per repository.
+"""
+
 
 class LLMSummarizer:
-    def __init__(self, config: Optional[Config] = None):
+    MAX_RETRIES = 3
+    RETRY_BACKOFF = 1.0
+    # README characters included in the prompt context
+    README_CONTEXT_CHARS = 2000
+
+    def __init__(self, config: Optional[Config] = None, summary_cache: Optional[SummaryCache] = None):
         self.config = config or Config()
         self.llm_config = self.config.llm
         self._client = None
+        self._summary_cache = summary_cache
+
+    @property
+    def summary_cache(self) -> SummaryCache:
+        if self._summary_cache is None:
+            self._summary_cache = SummaryCache(ttl_days=self.llm_config.cache_ttl_days)
+        return self._summary_cache
 
     @property
     def client(self):
         if self._client is None:
+            # Keep-alive pool sized for concurrent summaries; retries only reconnect failures
+            pool_size = max(self.llm_config.concurrency, 1)
+            transport = httpx.HTTPTransport(
+                http2=_HTTP2_AVAILABLE,
+                limits=httpx.Limits(max_keepalive_connections=pool_size, max_connections=pool_size),
+                retries=2
+            )
+
             # Create custom httpx client with Claude Code headers
             http_client = httpx.Client(
                 headers={
@@ -25,63 +87,201 @@ class LLMSummarizer:
                     "X-Client-Platform": "cli",
                     "X-Client-Version": "1.0.0",
                 },
-                timeout=httpx.Timeout(60.0, connect=10.0)
+                timeout=httpx.Timeout(60.0, connect=10.0),
+                transport=transport
             )
 
+            # SDK retries are off: _call_llm_with_backoff owns the 429 retry budget, and stacking
+            # both would multiply attempts and sleep time
             if self.llm_config.provider == "openai":
                 from openai import OpenAI
                 self._client = OpenAI(
                     api_key=self.llm_config.api_key,
                     base_url=self.llm_config.base_url or None,
-                    http_client=http_client
+                    http_client=http_client,
+                    max_retries=0
                 )
             elif self.llm_config.provider == "anthropic":
                 from anthropic import Anthropic
                 self._client = Anthropic(
                     api_key=self.llm_config.api_key,
                     base_url=self.llm_config.base_url or None,
-                    http_client=http_client
+                    http_client=http_client,
+                    max_retries=0
                 )
             else:
                 raise ValueError(f"Unsupported LLM provider: {self.llm_config.provider}")
         return self._client
 
+    def prepare(self) -> None:
+        """Create the shared client and cache table before calling from worker threads"""
+        try:
+            self.client
+        except Exception as e:
+            logger.error(f"Failed to create LLM client: {e}")
+        self.summary_cache.ensure_table()
+
     def summarize_repository(self, repo: Repository) -> str:
         """Generate summary with stars, description, and AI analysis"""
+        cache_key = self._summary_cache_key(repo)
+
+        ai_summary = self.summary_cache.get(cache_key)
+        if ai_summary is not None:
+            logger.debug(f"Using cached summary for {repo.full_name}")
+        else:
+            ai_summary = self._generate_ai_summary(repo, cache_key)
+
+        # Build final summary with all three parts
+        return self._build_final_summary(repo, ai_summary)
+
+    def summarize_repositories(self, repos: List[Repository]) -> List[str]:
+        """Summarize repositories concurrently, returning summaries in input order
+
+        Cached summaries are looked up in one query; only misses reach the LLM.
+        """
+        if not repos:
+            return []
+
+        cache_keys = [self._summary_cache_key(repo) for repo in repos]
+        cached = self.summary_cache.get_many(cache_keys)
+        misses = [(repo, key) for repo, key in zip(repos, cache_keys) if key not in cached]
+        logger.info(f"Summary cache: {len(repos) - len(misses)} hits, {len(misses)} to generate")
+
+        if misses:
+            self.prepare()
+
+            # With llm.batch_size > 1, several repositories share one request
+            batch_size = max(self.llm_config.batch_size, 1)
+            batches = [misses[i:i + batch_size] for i in range(0, len(misses), batch_size)]
+
+            def generate(batch) -> List[Optional[str]]:
+                if len(batch) == 1:
+                    repo, key = batch[0]
+                    logger.info(f"Summarizing repository: {repo.full_name}")
+                    return [self._generate_ai_summary(repo, key)]
+                return self._generate_batch_summaries(batch)
+
+            max_workers = min(max(self.llm_config.concurrency, 1), len(batches))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                for batch, ai_summaries in zip(batches, executor.map(generate, batches)):
+                    for (repo, key), ai_summary in zip(batch, ai_summaries):
+                        cached[key] = ai_summary
+
+        return [self._build_final_summary(repo, cached[key]) for repo, key in zip(repos, cache_keys)]
+
+    def _generate_ai_summary(
+        self,
+        repo: Repository,
+        cache_key: str,
+        max_retries: Optional[int] = None
+    ) -> Optional[str]:
+        """Call the LLM for one repository and cache a successful result"""
         prompt = self._build_summary_prompt(repo)
 
         try:
-            response = self._call_llm(prompt)
-            ai_summary = self._parse_response(response)
-            ai_summary = ai_summary.strip()
+            response = self._call_llm_with_backoff(prompt, max_retries)
+            ai_summary = self._parse_response(response).strip()
         except Exception as e:
             logger.error(f"Failed to summarize repository {repo.full_name}: {e}")
-            ai_summary = None
+            return None
 
-        # Build final summary with all three parts
-        return self._build_final_summary(repo, ai_summary)
+        if ai_summary:
+            self.summary_cache.put(cache_key, ai_summary)
+        return ai_summary
 
-    def summarize_repositories(self, repos: List[Repository]) -> List[str]:
-        summaries = []
-        for repo in repos:
-            logger.info(f"Summarizing repository: {repo.full_name}")
-            summary = self.summarize_repository(repo)
-            summaries.append(summary)
-        return summaries
+    def _generate_batch_summaries(self, batch: List[Tuple[Repository, str]]) -> List[Optional[str]]:
+        """Summarize several repositories with one LLM call, falling back to one call each on a bad reply
+
+        At most MAX_RETRIES + 1 + len(batch) requests are made per batch: fallback calls get a
+        single attempt, and none are made once the batched call itself was rate limited.
+        """
+        logger.info(f"Summarizing {len(batch)} repositories in one request")
+        prompt = self._build_batch_prompt([repo for repo, _ in batch])
+
+        try:
+            by_index = self._parse_batch_response(self._call_llm_with_backoff(prompt))
+        except Exception as e:
+            if getattr(e, "status_code", None) == 429:
+                logger.error(f"Batched summary still rate limited, skipping {len(batch)} repositories")
+                return [None] * len(batch)
+            logger.warning(f"Batched summary failed, summarizing individually: {e}")
+            by_index = {}
+
+        ai_summaries = []
+        for index, (repo, key) in enumerate(batch, start=1):
+            ai_summary = by_index.get(index)
+            if ai_summary:
+                self.summary_cache.put(key, ai_summary)
+            else:
+                ai_summary = self._generate_ai_summary(repo, key, max_retries=0)
+            ai_summaries.append(ai_summary)
+        return ai_summaries
+
+    def _build_batch_prompt(self, repos: List[Repository]) -> str:
+        parts = [_BATCH_PROMPT_HEADER]
+        for index, repo in enumerate(repos, start=1):
+            parts.append(
+                f"\nRepo {index}: {repo.full_name}\n"
+                f"Language: {repo.language or 'Unknown'}\n"
+                f"{self._build_context(repo)}\n"
+            )
+        return "".join(parts)
+
+    @staticmethod
+    def _parse_batch_response(response: str) -> Dict[int, str]:
+        """Map 1-based repository index to summary from a JSON-array reply"""
+        match = _JSON_ARRAY_RE.search(response)
+        if not match:
+            raise ValueError("no JSON array in response")
+
+        by_index = {}
+        for item in json.loads(match.group(0)):
+            if isinstance(item, dict) and isinstance(item.get("summary"), str):
+                try:
+                    by_index[int(item.get("index"))] = item["summary"].strip()
+                except (TypeError, ValueError):
+                    continue
+        return by_index
+
+    def _summary_cache_key(self, repo: Repository) -> str:
+        """Hash of the repository content and the prompt settings that shape its summary
+
+        Star counts are left out so a repository's summary survives daily star changes;
+        a different provider, model or template produces a different key.
+        """
+        material = "\0".join((
+            self.llm_config.provider,
+            self.llm_config.model,
+            self.llm_config.summary_prompt,
+            repo.full_name,
+            repo.description or "",
+            repo.language or "",
+            self._build_context(repo),
+        ))
+        return hashlib.blake2b(material.encode("utf-8"), digest_size=16).hexdigest()
 
     def _build_summary_prompt(self, repo: Repository) -> str:
         prompt_template = self.llm_config.summary_prompt
         context = self._build_context(repo)
 
-        prompt = prompt_template.format(
-            repo_name=repo.full_name,
-            description=repo.description or "No description",
-            language=repo.language or "Unknown",
-            stars=repo.stars,
-            readme=context
-        )
+        values = {
+            "repo_name": repo.full_name,
+            "description": repo.description or "No description",
+            "language": repo.language or "Unknown",
+            "stars": repo.stars,
+            "readme": context,
+        }
+
+        pieces = _compile_prompt_template(prompt_template)
+        if pieces is None:
+            return prompt_template.format(**values)
 
-        return prompt
+        parts = []
+        for literal, field in pieces:
+            parts.append(literal)
+            if field is not None:
+                parts.append(str(values[field]))
+        return "".join(parts)
 
     def _build_context(self, repo: Repository) -> str:
         context_parts = []
@@ -90,17 +290,31 @@ class LLMSummarizer:
             context_parts.append(f"Description: {repo.description}")
 
         if repo.readme_content:
-            readme_snippet = repo.readme_content[:2000]
+            readme_snippet = repo.readme_content[:self.README_CONTEXT_CHARS]
             context_parts.append(f"README content:\n{readme_snippet}")
 
         return "\n".join(context_parts) if context_parts else "No additional context available"
 
+    def _call_llm_with_backoff(self, prompt: str, max_retries: Optional[int] = None) -> str:
+        """Call the LLM, retrying rate-limited (429) responses with jittered exponential backoff"""
+        if max_retries is None:
+            max_retries = self.MAX_RETRIES
+        for attempt in range(max_retries + 1):
+            try:
+                return self._call_llm(prompt)
+            except Exception as e:
+                if getattr(e, "status_code", None) != 429 or attempt == max_retries:
+                    raise
+                delay = self.RETRY_BACKOFF * (2 ** attempt) * random.uniform(0.5, 1.5)
+                logger.warning(f"LLM rate limited, retrying in {delay:.1f}s")
+                time.sleep(delay)
+
     def _call_llm(self, prompt: str) -> str:
         if self.llm_config.provider == "openai":
             response = self.client.chat.completions.create(
                 model=self.llm_config.model,
                 messages=[
-                    {"role": "system", "content": "You are a helpful tech analyst assistant."},
+                    _SYSTEM_MESSAGE,
                     {"role": "user", "content": prompt}
                 ],
                 max_tokens=self.llm_config.max_tokens,
@@ -126,10 +340,9 @@ class LLMSummarizer:
         return ""
 
     def _parse_response(self, response: str) -> str:
-        lines = response.strip().split("\n")
-        for line in lines:
-            if line.strip() and not line.startswith("#"):
-                return line.strip()
+        match = _FIRST_LINE_RE.search(response.strip())
+        if match:
+            return match.group(1).strip()
 
         if len(response) > 10:
             return response.strip()[:200]
@@ -0,0 +1,114 @@
+"""SQLite cache for LLM summaries, so unchanged repositories skip the API call"""
+
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy import Column, DateTime, String, Text, create_engine, event, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session, sessionmaker
+
+from src.filter import DEFAULT_DB_PATH, Base, _set_sqlite_pragmas
+
+logger = logging.getLogger(__name__)
+
+
+class SummaryCacheRecord(Base):
+    __tablename__ = "summary_cache"
+
+    key = Column(String(64), primary_key=True)
+    summary = Column(Text, nullable=False)
+    created_at = Column(DateTime, nullable=False)
+
+
+class SummaryCache:
+    """Store AI summaries keyed by a hash of the repository content and prompt settings"""
+
+    LOOKUP_CHUNK_SIZE = 500
+
+    def __init__(self, db_path: Optional[str] = None, ttl_days: int = 7):
+        self.db_path = db_path or DEFAULT_DB_PATH
+        self.ttl_days = ttl_days
+        self._engine = None
+        self._session_factory = None
+
+    @property
+    def engine(self):
+        if self._engine is None:
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            self._engine = create_engine(f"sqlite:///{self.db_path}", echo=False)
+            event.listen(self._engine, "connect", _set_sqlite_pragmas)
+        return self._engine
+
+    @property
+    def session_factory(self):
+        if self._session_factory is None:
+            SummaryCacheRecord.__table__.create(self.engine, checkfirst=True)
+            self._session_factory = sessionmaker(bind=self.engine)
+        return self._session_factory
+
+    def ensure_table(self) -> None:
+        """Create the cache table now rather than on the first get/put"""
+        try:
+            self.session_factory
+        except Exception as e:
+            logger.warning(f"Failed to create summary cache table: {e}")
+
+    def get_session(self) -> Session:
+        return self.session_factory()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached summary for key, or None if missing or older than ttl_days"""
+        threshold_date = datetime.now() - timedelta(days=self.ttl_days)
+
+        try:
+            with self.get_session() as session:
+                return session.execute(
+                    select(SummaryCacheRecord.summary).where(
+                        SummaryCacheRecord.key == key,
+                        SummaryCacheRecord.created_at >= threshold_date
+                    )
+                ).scalar_one_or_none()
+        except Exception as e:
+            logger.warning(f"Failed to read summary cache: {e}")
+            return None
+
+    def get_many(self, keys: List[str]) -> Dict[str, str]:
+        """Return {key: summary} for every fresh cached entry among keys"""
+        threshold_date = datetime.now() - timedelta(days=self.ttl_days)
+        found = {}
+
+        try:
+            with self.get_session() as session:
+                # Chunked to stay under SQLite's bound-parameter limit
+                for start in range(0, len(keys), self.LOOKUP_CHUNK_SIZE):
+                    rows = session.execute(
+                        select(SummaryCacheRecord.key, SummaryCacheRecord.summary).where(
+                            SummaryCacheRecord.key.in_(keys[start:start + self.LOOKUP_CHUNK_SIZE]),
+                            SummaryCacheRecord.created_at >= threshold_date
+                        )
+                    )
+                    found.update({row.key: row.summary for row in rows})
+        except Exception as e:
+            logger.warning(f"Failed to read summary cache: {e}")
+
+        return found
+
+    def put(self, key: str, summary: str) -> None:
+        stmt = sqlite_insert(SummaryCacheRecord).values(
+            key=key,
+            summary=summary,
+            created_at=datetime.now()
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[SummaryCacheRecord.key],
+            set_={"summary": stmt.excluded.summary, "created_at": stmt.excluded.created_at}
+        )
+
+        try:
+            with self.get_session() as session:
+                session.execute(stmt)
+                session.commit()
+        except Exception as e:
+            logger.warning(f"Failed to write summary cache: {e}")
@@ -1,10 +1,16 @@
 """Logging configuration for GitHub Trending application"""
 
+import atexit
 import logging
 import os
+import queue
 from datetime import datetime
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
+from typing import Optional
+
+# Background thread that writes records queued by the root logger to the file and console
+_listener: Optional[QueueListener] = None
 
 
 def setup_logging(
@@ -43,7 +49,9 @@ def setup_logging(
     root_logger = logging.getLogger()
     root_logger.setLevel(log_level)
 
-    # Remove existing handlers to avoid duplicates
+    # Drain and close the previous listener before replacing its handlers, so repeated
+    # calls never leave a second listener thread or a stale log file open
+    _stop_listener()
     root_logger.handlers.clear()
 
     # File handler with rotation
@@ -55,13 +63,19 @@ def setup_logging(
     )
     file_handler.setLevel(log_level)
     file_handler.setFormatter(detailed_formatter)
-    root_logger.addHandler(file_handler)
 
     # Console handler
     console_handler = logging.StreamHandler()
     console_handler.setLevel(log_level)
     console_handler.setFormatter(console_formatter)
-    root_logger.addHandler(console_handler)
+
+    # QueueHandler.prepare() still formats each record in the calling thread; only the
+    # file and console writes move to the listener thread
+    global _listener
+    log_queue = queue.Queue(-1)
+    root_logger.addHandler(QueueHandler(log_queue))
+    _listener = QueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+    _listener.start()
 
     # Log startup message
     logger = logging.getLogger(__name__)
@@ -71,6 +85,19 @@ def setup_logging(
     logger.info("=" * 60)
 
 
+def _stop_listener() -> None:
+    """Flush queued records, stop the listener thread and close its handlers"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(_stop_listener)
+
+
 def get_logger(name: str) -> logging.Logger:
     """
     Get a logger instance with the specified name.
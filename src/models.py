@@ -1,10 +1,13 @@
 from datetime import datetime
 from typing import Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 class Repository(BaseModel):
+    # Rows read back from our own database are built with model_construct (no validation)
+    model_config = ConfigDict(extra='ignore')
+
     name: str
     full_name: str
     description: Optional[str] = None
@@ -23,6 +26,8 @@ class Repository(BaseModel):
     first_seen_at: datetime = None
     last_seen_at: datetime = None
     appearance_count: int = 1
+    # Stars gained in the trending period, as shown on the trending page (not persisted)
+    stars_today: int = 0
 
     def __hash__(self):
         return hash(self.full_name)
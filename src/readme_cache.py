@@ -0,0 +1,75 @@
+"""On-disk response caches used for conditional (ETag) requests"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class ReadmeCache:
+    """Store decoded README content and its ETag, one JSON file per repository"""
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        self.cache_dir = Path(cache_dir or os.path.join(
+            os.path.dirname(os.path.dirname(__file__)),
+            "data",
+            "readme_cache"
+        ))
+
+    def _path(self, repo_full_name: str) -> Path:
+        return self.cache_dir / f"{repo_full_name.replace('/', '__')}.json"
+
+    def get(self, repo_full_name: str) -> Optional[Tuple[str, str]]:
+        """
+        Get cached README
+
+        Args:
+            repo_full_name: Repository full name, e.g., "owner/repo"
+
+        Returns:
+            (etag, content) tuple, or None if not cached
+        """
+        try:
+            with open(self._path(repo_full_name), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            return entry["etag"], entry["content"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def age(self, repo_full_name: str) -> Optional[float]:
+        """Seconds since the entry was last written, or None if not cached"""
+        try:
+            return time.time() - os.path.getmtime(self._path(repo_full_name))
+        except OSError:
+            return None
+
+    def put(self, repo_full_name: str, etag: str, content: str) -> None:
+        """Store README content with its ETag (atomic replace, safe across threads)"""
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({"etag": etag, "content": content}, f, ensure_ascii=False)
+            os.replace(tmp_path, self._path(repo_full_name))
+        except OSError as e:
+            logger.warning(f"Failed to cache README for {repo_full_name}: {e}")
+
+
+class ResponseCache(ReadmeCache):
+    """Same ETag/body store keyed by arbitrary strings such as URLs (file names are hashed)"""
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        super().__init__(cache_dir or os.path.join(
+            os.path.dirname(os.path.dirname(__file__)),
+            "data",
+            "http_cache"
+        ))
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{hashlib.blake2b(key.encode('utf-8'), digest_size=16).hexdigest()}.json"
@@ -1,10 +1,11 @@
 import logging
 import signal
 import sys
-import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Callable, Optional
+from typing import Callable, List, Optional, Tuple
 
 from apscheduler.schedulers.blocking import BlockingScheduler
 from apscheduler.triggers.cron import CronTrigger
@@ -14,7 +15,7 @@ from src.emailer import EmailSender
 from src.fetcher import GitHubFetcher
 from src.filter import RepositoryFilter
 from src.logger_config import setup_logging
-from src.models import TrendingReport
+from src.models import Repository, TrendingReport
 
 logger = logging.getLogger(__name__)
 
@@ -23,7 +24,18 @@ class Scheduler:
         self.config = config or Config()
         self.scheduler_config = self.config.scheduler
         self._scheduler = None
-        self._lock = threading.Lock()
+        # Reused across runs so HTTP keep-alive pools survive between ticks
+        self.fetcher = GitHubFetcher(self.config)
+        self.emailer = EmailSender(self.config)
+        self._llm_summarizer = None
+
+    @property
+    def llm_summarizer(self):
+        """Summarizer shared by every run, so its HTTP client and cache survive between ticks"""
+        if self._llm_summarizer is None:
+            from src.llm import LLMSummarizer
+            self._llm_summarizer = LLMSummarizer(self.config)
+        return self._llm_summarizer
 
     def start(self, run_immediately: bool = False) -> None:
         if not self.scheduler_config.enabled:
@@ -34,16 +46,18 @@ class Scheduler:
             timezone=self.scheduler_config.timezone
         )
 
-        trigger = CronTrigger(
-            hour=self.scheduler_config.time.split(":")[0],
-            minute=self.scheduler_config.time.split(":")[1]
-        )
+        hour, _, minute = self.scheduler_config.time.partition(":")
+        trigger = CronTrigger(hour=hour, minute=minute)
 
         self._scheduler.add_job(
             self._run_task,
             trigger=trigger,
             id="github_trending_task",
             name="GitHub Trending Analysis",
+            # APScheduler skips overlapping runs and folds missed ticks into one
+            max_instances=1,
+            coalesce=True,
+            misfire_grace_time=60,
             replace_existing=True
         )
 
@@ -64,26 +78,21 @@ class Scheduler:
         if self._scheduler and self._scheduler.running:
             self._scheduler.shutdown(wait=False)
             logger.info("Scheduler stopped")
+        self.fetcher.close()
 
     def _run_task(self) -> None:
-        if not self._lock.acquire(blocking=False):
-            logger.warning("Task already running, skipping...")
-            return
-
-        start_time = datetime.now()
+        start_time = time.monotonic()
 
         try:
             logger.info("Starting GitHub trending analysis task...")
             report = self._execute_pipeline()
-            logger.info(f"Task completed in {(datetime.now() - start_time).total_seconds():.2f}s")
+            logger.info(f"Task completed in {time.monotonic() - start_time:.2f}s")
         except Exception as e:
             logger.error(f"Task failed: {e}", exc_info=True)
-        finally:
-            self._lock.release()
 
     def _execute_pipeline(self) -> TrendingReport:
         logger.info("Step 1: Fetching GitHub trending repositories...")
-        fetcher = GitHubFetcher(self.config)
+        fetcher = self.fetcher
         repos = fetcher.fetch_trending_repos()
 
         logger.info(f"Step 2: Filtering new repositories from {len(repos)} trending repos...")
@@ -103,30 +112,24 @@ class Scheduler:
                 repositories=[]
             )
 
-        logger.info("Step 3: Enriching repositories with README...")
-        enriched_repos = []
-        for repo in new_repos:
-            enriched_repo = fetcher.enrich_repository(repo)
-            enriched_repos.append(enriched_repo)
-
-        logger.info("Step 4: Saving to database...")
-        repo_filter.save_repositories(enriched_repos)
-
-        logger.info("Step 5: Generating summaries and sending email...")
-        # Create report with repositories in original order (no ranking)
-        from src.llm import LLMSummarizer
+        logger.info("Step 3: Enriching repositories with README and generating summaries...")
         from src.models import RepositorySummary
 
-        llm_summarizer = LLMSummarizer(self.config)
+        if self.config.llm.batch_size > 1:
+            # Batched prompts group misses across the whole list, so enrichment finishes first
+            enriched_repos = fetcher.enrich_repositories(new_repos)
+            logger.info("Step 4: Saving to database...")
+            repo_filter.save_repositories(enriched_repos)
+            logger.info("Step 5: Generating summaries and sending email...")
+            summaries = self.llm_summarizer.summarize_repositories(enriched_repos)
+        else:
+            enriched_repos, summaries = self._enrich_and_summarize(new_repos, repo_filter)
 
-        repository_summaries = []
-        for repo in enriched_repos:
-            summary = llm_summarizer.summarize_repository(repo)
-            repo_summary = RepositorySummary(
-                repository=repo,
-                summary=summary
-            )
-            repository_summaries.append(repo_summary)
+        # Create report with repositories in original order (no ranking)
+        repository_summaries = [
+            RepositorySummary.model_construct(repository=repo, summary=summary)
+            for repo, summary in zip(enriched_repos, summaries)
+        ]
 
         report = TrendingReport(
             generated_at=datetime.now(timezone.utc),
@@ -137,11 +140,38 @@ class Scheduler:
             repositories=repository_summaries
         )
 
-        emailer = EmailSender(self.config)
-        emailer.send_report(report)
+        self.emailer.send_report(report)
 
         return report
 
+    def _enrich_and_summarize(
+        self,
+        repos: List[Repository],
+        repo_filter: RepositoryFilter
+    ) -> Tuple[List[Repository], List[str]]:
+        """Fetch READMEs and summarize, handing each repository to the LLM pool as soon as it's enriched
+
+        README fetches and summaries overlap instead of running back to back; the
+        database save runs while summaries are still in flight.
+        """
+        llm_summarizer = self.llm_summarizer
+        llm_summarizer.prepare()
+
+        enriched_repos: List[Optional[Repository]] = [None] * len(repos)
+        summary_futures = {}
+        with ThreadPoolExecutor(max_workers=max(self.config.llm.concurrency, 1)) as llm_pool:
+            for index, repo in self.fetcher.iter_enriched(repos):
+                enriched_repos[index] = repo
+                summary_futures[index] = llm_pool.submit(llm_summarizer.summarize_repository, repo)
+
+            logger.info("Step 4: Saving to database...")
+            repo_filter.save_repositories(enriched_repos)
+
+            logger.info("Step 5: Waiting for summaries and sending email...")
+            summaries = [summary_futures[index].result() for index in range(len(repos))]
+
+        return enriched_repos, summaries
+
     def run_once(self) -> TrendingReport:
         return self._execute_pipeline()
 
@@ -182,7 +212,10 @@ class App:
             llm_summarizer = LLMSummarizer(self.config)
 
             # Get recent repositories (last 3 days)
-            recent_repos = repo_filter.get_recent_repos(days=3)
+            recent_repos = repo_filter.get_recent_repos(
+                days=3,
+                readme_chars=LLMSummarizer.README_CONTEXT_CHARS
+            )
 
             if not recent_repos:
                 logger.warning("No recent repositories found in database")
@@ -191,14 +224,11 @@ class App:
             logger.info(f"Found {len(recent_repos)} recent repositories")
 
             # Create RepositorySummary objects with AI summaries
-            repository_summaries = []
-            for repo in recent_repos:
-                summary = llm_summarizer.summarize_repository(repo)
-                repo_summary = RepositorySummary(
-                    repository=repo,
-                    summary=summary
-                )
-                repository_summaries.append(repo_summary)
+            summaries = llm_summarizer.summarize_repositories(recent_repos)
+            repository_summaries = [
+                RepositorySummary.model_construct(repository=repo, summary=summary)
+                for repo, summary in zip(recent_repos, summaries)
+            ]
 
             # Create a report
             report = TrendingReport(
@@ -223,21 +253,8 @@ class App:
             # Send the email
             subject = self.config.email.subject or "GitHub Trending Report"
 
-            success = True
-            for recipient in self.config.email.to_addresses:
-                try:
-                    email_sender._send_email(
-                        to_addr=recipient,
-                        subject=subject,
-                        html_content=html_content,
-                        text_content=text_content
-                    )
-                    logger.info(f"Email sent successfully to {recipient}")
-                except Exception as e:
-                    logger.error(f"Failed to send email to {recipient}: {e}", exc_info=True)
-                    success = False
-
-            return success
+            # One SMTP session for every recipient
+            return email_sender.send_content(subject, html_content, text_content)
 
         except Exception as e:
             logger.error(f"Failed to send report: {e}", exc_info=True)
@@ -1,37 +1,116 @@
 """Scrape GitHub Trending page (real trending data)"""
 
+import asyncio
+import email.utils
+import importlib.util
+import json
 import logging
+import random
 import re
+import sys
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
+import httpx
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup, SoupStrainer
 
 from src.models import Repository
+from src.readme_cache import ResponseCache
 
 logger = logging.getLogger(__name__)
 
+_WHITESPACE_RE = re.compile(r'\s+')
+# Leading number with an optional standalone k/M/B suffix; trailing words ("stars today") are ignored
+_NUMBER_RE = re.compile(r'\s*(\d+(?:\.\d*)?|\.\d+)\s*([kmb](?![a-z]))?', re.IGNORECASE)
+_SUFFIX_MULTIPLIERS = {None: 1, 'k': 1000, 'm': 1_000_000, 'b': 1_000_000_000}
+
+# datetime.fromisoformat() only accepts a trailing 'Z' from Python 3.11
+_ISOFORMAT_ACCEPTS_Z = sys.version_info >= (3, 11)
+_API_TIMESTAMP_FIELDS = ("created_at", "updated_at", "pushed_at")
+
+_GRAPHQL_URL = "https://api.github.com/graphql"
+# Fields fetched per aliased repository; mapped back to the REST payload shape by _graphql_to_rest
+_GRAPHQL_REPO_FIELDS = (
+    "createdAt updatedAt pushedAt owner { avatarUrl } "
+    "openIssues: issues(states: OPEN) { totalCount } "
+    "openPullRequests: pullRequests(states: OPEN) { totalCount }"
+)
+
+
+def _parse_github_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """Parse a GitHub API timestamp such as '2024-01-01T00:00:00Z'"""
+    if not value:
+        return None
+    if not _ISOFORMAT_ACCEPTS_Z and value.endswith('Z'):
+        value = value[:-1] + '+00:00'
+    return datetime.fromisoformat(value)
+
+
+# libxml2-backed parser when lxml is installed, otherwise the pure-Python stdlib one
+_HTML_PARSER = "lxml" if importlib.util.find_spec("lxml") is not None else "html.parser"
+# HTTP/2 needs the optional h2 package (pip install httpx[http2])
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+# Only <article> elements (the repository cards) are built into the tree
+_TRENDING_ARTICLES = SoupStrainer("article")
+# Tags _parse_repo_article inspects while walking a repository card
+_CARD_TAGS = ('a', 'h2', 'span', 'img')
+
+
+def _run_coroutine(coro):
+    """asyncio.run(coro), moved to a worker thread when the caller already runs an event loop"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
 
 class GitHubTrendingScraper:
     """Scrape https://github.com/trending page"""
 
     # Maximum retry attempts
     MAX_RETRIES = 3
-    # Retry delay in seconds
+    # Base retry delay in seconds (full-jitter exponential backoff)
     RETRY_DELAY = 2
-    # API concurrent workers
-    API_MAX_WORKERS = 5
-
-    def __init__(self, max_retries: int = None):
+    # Upper bound for a single retry delay in seconds
+    RETRY_MAX_DELAY = 30
+    # Concurrent GitHub API requests during enrichment
+    API_MAX_CONCURRENCY = 20
+    # Concurrent trending page fetches in scrape_many
+    PAGE_MAX_CONCURRENCY = 8
+    # Repositories per GraphQL enrichment query
+    GRAPHQL_BATCH_SIZE = 50
+    # Seconds a cached API payload is applied without contacting GitHub
+    API_CACHE_TTL = 3600
+    # Pause REST enrichment when X-RateLimit-Remaining drops below this
+    RATE_LIMIT_WATERMARK = 10
+    # Longest pause in seconds waiting for X-RateLimit-Reset
+    RATE_LIMIT_MAX_WAIT = 60
+
+    def __init__(self, max_retries: int = None, response_cache: Optional[ResponseCache] = None):
         self.base_url = "https://github.com/trending"
         self.session = requests.Session()
+        # Pool sized for concurrent use of the shared session; retries stay in _fetch_with_retry,
+        # which applies jittered backoff and Retry-After
+        adapter = HTTPAdapter(
+            pool_connections=self.API_MAX_CONCURRENCY,
+            pool_maxsize=self.API_MAX_CONCURRENCY
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
         self.session.headers.update({
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
         })
         self.max_retries = max_retries or self.MAX_RETRIES
+        # ETag store for conditional page/API requests; None disables revalidation
+        self.response_cache = response_cache
+        # Epoch time before which REST enrichment holds off (set from rate-limit headers)
+        self._api_resume_at = 0.0
 
     def scrape_trending(
         self,
@@ -54,7 +133,65 @@ class GitHubTrendingScraper:
         Returns:
             List of repositories
         """
-        # Build URL
+        url = self._build_url(period, language)
+        logger.info(f"Scraping URL: {url}")
+
+        # Fetch page with retry mechanism
+        soup = self._fetch_with_retry(url, parse_only=_TRENDING_ARTICLES)
+        if not soup:
+            return []
+
+        repos = self._parse_trending_page(soup, limit)
+
+        # Batch fetch complete info using GitHub API (concurrent)
+        if enrich_with_api and github_token and repos:
+            repos = self._enrich_repos_from_api_batch(repos, github_token)
+
+        return repos
+
+    def scrape_many(
+        self,
+        specs: List[Tuple[str, str, int]],
+        enrich_with_api: bool = False,
+        github_token: str = None
+    ) -> List[List[Repository]]:
+        """
+        Scrape several trending pages concurrently over the shared session
+
+        Args:
+            specs: (period, language, limit) for each page
+            enrich_with_api: Whether to use GitHub API to fetch complete info
+            github_token: GitHub token (for API requests)
+
+        Returns:
+            One repository list per spec, in the same order (empty for pages that failed)
+        """
+        if not specs:
+            return []
+
+        urls = [self._build_url(period, language) for period, language, _ in specs]
+        logger.info(f"Scraping {len(urls)} trending pages concurrently")
+
+        with ThreadPoolExecutor(max_workers=min(len(urls), self.PAGE_MAX_CONCURRENCY)) as executor:
+            soups = list(executor.map(
+                lambda url: self._fetch_with_retry(url, parse_only=_TRENDING_ARTICLES), urls
+            ))
+
+        now = datetime.now(timezone.utc)
+        results = [
+            self._parse_trending_page(soup, limit, now) if soup else []
+            for soup, (_, _, limit) in zip(soups, specs)
+        ]
+
+        # One enrichment pass over every page so GraphQL batches stay full
+        all_repos = [repo for repos in results for repo in repos]
+        if enrich_with_api and github_token and all_repos:
+            self._enrich_repos_from_api_batch(all_repos, github_token)
+
+        return results
+
+    def _build_url(self, period: str, language: str) -> str:
+        """Build trending page URL for a period and language"""
         url = self.base_url
         if language:
             url = f"{self.base_url}/{language}"
@@ -63,29 +200,27 @@ class GitHubTrendingScraper:
         since = self._get_since_param(period)
         if since:
             url = f"{url}?since={since}"
+        return url
 
-        logger.info(f"Scraping URL: {url}")
-
-        # Fetch page with retry mechanism
-        soup = self._fetch_with_retry(url)
-        if not soup:
-            return []
-
-        # Parse repository list
+    def _parse_trending_page(
+        self,
+        soup: BeautifulSoup,
+        limit: int,
+        now: Optional[datetime] = None
+    ) -> List[Repository]:
+        """Parse up to limit repository cards from a fetched trending page"""
         repos = []
-        articles = soup.select('article.Box-row')
+        articles = soup.find_all('article', class_='Box-row')
 
         logger.info(f"Found {len(articles)} repositories on trending page")
 
+        # One timestamp for the whole page rather than one per article
+        if now is None:
+            now = datetime.now(timezone.utc)
         for article in articles[:limit]:
-            repo = self._parse_repo_article(article)
+            repo = self._parse_repo_article(article, now)
             if repo:
                 repos.append(repo)
-
-        # Batch fetch complete info using GitHub API (concurrent)
-        if enrich_with_api and github_token and repos:
-            repos = self._enrich_repos_from_api_batch(repos, github_token)
-
         return repos
 
     def _get_since_param(self, period: str) -> str:
@@ -97,38 +232,78 @@ class GitHubTrendingScraper:
         }
         return mapping.get(period, "daily")
 
-    def _fetch_with_retry(self, url: str, timeout: int = 30) -> Optional[BeautifulSoup]:
+    def _fetch_with_retry(
+        self,
+        url: str,
+        timeout: int = 30,
+        parse_only: Optional[SoupStrainer] = None
+    ) -> Optional[BeautifulSoup]:
         """
         Fetch page with retry mechanism
 
         Args:
             url: Request URL
             timeout: Request timeout
+            parse_only: Restrict parsing to matching elements
 
         Returns:
             BeautifulSoup object, returns None on failure
         """
         last_error = None
+        cached = self.response_cache.get(url) if self.response_cache else None
+        headers = None
+        if cached and cached[0]:
+            headers = {"If-None-Match": cached[0]}
+        elif cached:
+            # No ETag was served; revalidate against the time of the last successful fetch
+            age = self.response_cache.age(url)
+            if age is not None:
+                headers = {"If-Modified-Since": email.utils.formatdate(time.time() - age, usegmt=True)}
 
         for attempt in range(self.max_retries):
             try:
-                response = self.session.get(url, timeout=timeout)
+                response = self.session.get(url, headers=headers, timeout=timeout)
+                if cached and response.status_code == 304:
+                    logger.debug(f"{url} not modified, using cached page")
+                    return BeautifulSoup(cached[1], _HTML_PARSER, parse_only=parse_only)
                 response.raise_for_status()
-                return BeautifulSoup(response.text, 'html.parser')
+                # GitHub serves UTF-8; setting it skips requests' charset detection on .text
+                response.encoding = 'utf-8'
+                html = response.text
+
+                if self.response_cache:
+                    self.response_cache.put(url, response.headers.get("ETag", ""), html)
+                return BeautifulSoup(html, _HTML_PARSER, parse_only=parse_only)
 
             except requests.exceptions.RequestException as e:
                 last_error = e
+                error_response = e.response
+                status = error_response.status_code if error_response is not None else None
+
+                # Client errors other than rate limiting won't succeed on retry
+                if status is not None and status < 500 and status != 429:
+                    logger.error(f"Failed to fetch {url}: HTTP {status}, not retrying")
+                    return None
+
                 logger.warning(f"Request failed (attempt {attempt + 1}/{self.max_retries}): {e}")
 
                 # If not the last attempt, wait and retry
                 if attempt < self.max_retries - 1:
-                    wait_time = self.RETRY_DELAY * (attempt + 1)
-                    logger.info(f"Retrying in {wait_time} seconds...")
+                    wait_time = self._retry_delay(attempt, error_response)
+                    logger.info(f"Retrying in {wait_time:.1f} seconds...")
                     time.sleep(wait_time)
 
         logger.error(f"Failed to fetch {url} after {self.max_retries} attempts: {last_error}")
         return None
 
+    def _retry_delay(self, attempt: int, response: Optional[requests.Response] = None) -> float:
+        """Retry-After from a 429 response if present, otherwise full-jitter exponential backoff"""
+        if response is not None and response.status_code == 429:
+            retry_after = response.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                return float(retry_after)
+        return random.uniform(0, min(self.RETRY_MAX_DELAY, self.RETRY_DELAY * 2 ** attempt))
+
     def _enrich_repos_from_api_batch(self, repos: List[Repository], github_token: str) -> List[Repository]:
         """
         Batch fetch GitHub API data using concurrent requests
@@ -138,77 +313,198 @@ class GitHubTrendingScraper:
             github_token: GitHub token
 
         Returns:
-            Enriched repository list
+            Enriched repository list (same order as input)
         """
-        def enrich_single(repo: Repository) -> Repository:
-            return self._enrich_repo_from_api(repo, github_token)
-
-        logger.info(f"Enriching {len(repos)} repositories with API data (concurrent)...")
-
-        with ThreadPoolExecutor(max_workers=self.API_MAX_WORKERS) as executor:
-            # Submit all tasks
-            future_to_repo = {executor.submit(enrich_single, repo): repo for repo in repos}
-
-            # Collect results
-            enriched = []
-            for future in as_completed(future_to_repo):
-                repo = future_to_repo[future]
-                try:
-                    enriched_repo = future.result()
-                    enriched.append(enriched_repo)
-                except Exception as e:
-                    logger.error(f"Error enriching {repo.full_name}: {e}")
-                    enriched.append(repo)  # Keep original data even on failure
-
-        return enriched
-
-    def _enrich_repo_from_api(self, repo: Repository, github_token: str) -> Repository:
-        """Fetch complete repository info using GitHub API"""
-        try:
-            headers = {"Authorization": f"token {github_token}"}
-            api_url = f"https://api.github.com/repos/{repo.full_name}"
+        logger.info(f"Enriching {len(repos)} repositories with API data...")
+        stale = self._apply_fresh_api_cache(repos)
+        remaining = self._enrich_repos_via_graphql(stale, github_token) if stale else []
+        if remaining:
+            # REST fallback for whatever GraphQL could not resolve (repos are enriched in place)
+            logger.info(f"Falling back to REST API for {len(remaining)} repositories")
+            _run_coroutine(self._enrich_repos_async(remaining, github_token))
+        return repos
 
-            response = self.session.get(api_url, headers=headers, timeout=10)
-            if response.status_code == 200:
-                data = response.json()
+    def _apply_fresh_api_cache(self, repos: List[Repository]) -> List[Repository]:
+        """Apply API payloads cached within API_CACHE_TTL; returns the repositories still to fetch"""
+        if not self.response_cache:
+            return repos
+
+        stale = []
+        for repo in repos:
+            cache_key = f"api:{repo.full_name}"
+            age = self.response_cache.age(cache_key)
+            cached = self.response_cache.get(cache_key) if age is not None and age < self.API_CACHE_TTL else None
+            if cached:
+                self._apply_api_data(repo, json.loads(cached[1]))
+            else:
+                stale.append(repo)
 
-                # Parse dates
-                created_at = None
-                if data.get("created_at"):
-                    created_at = datetime.fromisoformat(data["created_at"].replace('Z', '+00:00'))
+        if len(stale) < len(repos):
+            logger.info(f"Reused cached API data for {len(repos) - len(stale)} repositories")
+        return stale
 
-                updated_at = None
-                if data.get("updated_at"):
-                    updated_at = datetime.fromisoformat(data["updated_at"].replace('Z', '+00:00'))
+    def _enrich_repos_via_graphql(self, repos: List[Repository], github_token: str) -> List[Repository]:
+        """
+        Enrich repositories with one aliased GraphQL query per GRAPHQL_BATCH_SIZE repos
 
-                pushed_at = None
-                if data.get("pushed_at"):
-                    pushed_at = datetime.fromisoformat(data["pushed_at"].replace('Z', '+00:00'))
+        Args:
+            repos: Repository list (enriched in place)
+            github_token: GitHub token
 
-                # Update repository info
-                repo.created_at = created_at
-                repo.updated_at = updated_at
-                repo.pushed_at = pushed_at
-                repo.open_issues = data.get("open_issues_count", 0)
+        Returns:
+            Repositories that could not be enriched this way
+        """
+        remaining = []
+        for start in range(0, len(repos), self.GRAPHQL_BATCH_SIZE):
+            batch = repos[start:start + self.GRAPHQL_BATCH_SIZE]
+            fragments = []
+            for i, repo in enumerate(batch):
+                owner, _, name = repo.full_name.partition('/')
+                fragments.append(
+                    f"r{i}: repository(owner: {json.dumps(owner)}, name: {json.dumps(name)}) "
+                    f"{{ {_GRAPHQL_REPO_FIELDS} }}"
+                )
 
-                # Get owner avatar
-                if data.get("owner"):
-                    repo.owner_avatar_url = data["owner"].get("avatar_url")
+            try:
+                response = self.session.post(
+                    _GRAPHQL_URL,
+                    json={"query": "query { " + " ".join(fragments) + " }"},
+                    headers={"Authorization": f"bearer {github_token}"},
+                    timeout=10
+                )
+                response.raise_for_status()
+                # Unknown or renamed repos come back as null with an entry in "errors"
+                data = response.json().get("data") or {}
+            except (requests.exceptions.RequestException, ValueError) as e:
+                logger.warning(f"GraphQL enrichment failed for {len(batch)} repositories: {e}")
+                remaining.extend(batch)
+                continue
+
+            for i, repo in enumerate(batch):
+                node = data.get(f"r{i}")
+                if node:
+                    payload = self._graphql_to_rest(node)
+                    self._apply_api_data(repo, payload)
+                    if self.response_cache:
+                        # No ETag for GraphQL; the entry is only reused while fresh
+                        self.response_cache.put(f"api:{repo.full_name}", "", json.dumps(payload))
+                else:
+                    remaining.append(repo)
+        return remaining
+
+    @staticmethod
+    def _graphql_to_rest(node: Dict[str, Any]) -> Dict[str, Any]:
+        """Reshape a GraphQL repository node into the REST fields _apply_api_data reads"""
+        return {
+            "created_at": node.get("createdAt"),
+            "updated_at": node.get("updatedAt"),
+            "pushed_at": node.get("pushedAt"),
+            # REST's open_issues_count includes open pull requests
+            "open_issues_count": (
+                (node.get("openIssues") or {}).get("totalCount", 0)
+                + (node.get("openPullRequests") or {}).get("totalCount", 0)
+            ),
+            "owner": {"avatar_url": (node.get("owner") or {}).get("avatarUrl")}
+        }
 
-                logger.debug(f"Enriched {repo.full_name} with API data")
+    async def _enrich_repos_async(
+        self,
+        repos: List[Repository],
+        github_token: str,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ) -> List[Repository]:
+        """Enrich all repositories over one shared keep-alive client, bounded by API_MAX_CONCURRENCY"""
+        semaphore = asyncio.Semaphore(self.API_MAX_CONCURRENCY)
+        limits = httpx.Limits(
+            max_connections=self.API_MAX_CONCURRENCY,
+            max_keepalive_connections=self.API_MAX_CONCURRENCY
+        )
+
+        async with httpx.AsyncClient(
+            headers={"Authorization": f"token {github_token}"},
+            timeout=10,
+            limits=limits,
+            # Multiplexes the concurrent REST calls over one connection when h2 is installed
+            http2=_HTTP2_AVAILABLE,
+            transport=transport
+        ) as client:
+            results = await asyncio.gather(
+                *(self._enrich_repo_async(client, semaphore, repo) for repo in repos),
+                return_exceptions=True
+            )
 
+        enriched = []
+        for repo, result in zip(repos, results):
+            if isinstance(result, BaseException):
+                logger.error(f"Error enriching {repo.full_name}: {result}")
+                enriched.append(repo)  # Keep original data even on failure
             else:
-                logger.warning(f"Failed to fetch API data for {repo.full_name}: {response.status_code}")
-
-        except Exception as e:
-            logger.error(f"Error enriching {repo.full_name}: {e}")
+                enriched.append(result)
+        return enriched
 
+    async def _enrich_repo_async(
+        self,
+        client: httpx.AsyncClient,
+        semaphore: asyncio.Semaphore,
+        repo: Repository
+    ) -> Repository:
+        """Fetch complete repository info using GitHub API (async)"""
+        cache_key = f"api:{repo.full_name}"
+        cached = self.response_cache.get(cache_key) if self.response_cache else None
+        headers = {"If-None-Match": cached[0]} if cached and cached[0] else None
+
+        async with semaphore:
+            wait = self._api_resume_at - time.time()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            response = await client.get(f"https://api.github.com/repos/{repo.full_name}", headers=headers)
+        self._update_rate_limit(response.headers)
+
+        # 304s carry no body and don't count against the REST rate limit
+        if cached and response.status_code == 304:
+            self._apply_api_data(repo, json.loads(cached[1]))
+        elif response.status_code == 200:
+            self._apply_api_data(repo, response.json())
+            etag = response.headers.get("ETag") if self.response_cache else None
+            if etag:
+                self.response_cache.put(cache_key, etag, response.text)
+        else:
+            logger.warning(f"Failed to fetch API data for {repo.full_name}: {response.status_code}")
         return repo
 
-    def _parse_repo_article(self, article) -> Optional[Repository]:
+    def _update_rate_limit(self, headers) -> None:
+        """Hold off further API calls until the rate-limit reset when the remaining quota runs low"""
+        remaining = headers.get("X-RateLimit-Remaining", "")
+        reset = headers.get("X-RateLimit-Reset", "")
+        if not (remaining.isdigit() and reset.isdigit()) or int(remaining) >= self.RATE_LIMIT_WATERMARK:
+            return
+        now = time.time()
+        resume_at = min(float(reset), now + self.RATE_LIMIT_MAX_WAIT)
+        if resume_at > self._api_resume_at:
+            logger.warning(f"GitHub API rate limit low ({remaining} left), pausing {resume_at - now:.0f}s")
+            self._api_resume_at = resume_at
+
+    def _apply_api_data(self, repo: Repository, data: Dict[str, Any]) -> None:
+        """Copy dates, open issues and avatar from a GitHub API repository payload"""
+        # Update repository info
+        for field in _API_TIMESTAMP_FIELDS:
+            setattr(repo, field, _parse_github_timestamp(data.get(field)))
+        repo.open_issues = data.get("open_issues_count", 0)
+
+        # Get owner avatar
+        if data.get("owner"):
+            repo.owner_avatar_url = data["owner"].get("avatar_url")
+
+        logger.debug(f"Enriched {repo.full_name} with API data")
+
+    def _parse_repo_article(self, article, now: Optional[datetime] = None) -> Optional[Repository]:
         """
         Parse HTML for a single repository
 
+        Args:
+            article: article.Box-row element
+            now: Timestamp for first_seen_at/last_seen_at (defaults to current UTC time)
+
         GitHub Trending page structure:
         - article.Box-row
           - h2 > a (repo name and link)
@@ -216,63 +512,91 @@ class GitHubTrendingScraper:
           - div (contains language, stars, forks, etc.)
             - span[itemprop="programmingLanguage"] (language)
             - a[href$="/stargazers"] (total star count)
-            - a (stars added today, text like "234 stars today")
+            - span.float-sm-right (stars added today, text like "234 stars today")
             - a[href$="/network/members"] (fork count)
           - a > img (owner avatar)
         """
         try:
+            # Single walk over the card's tags instead of one CSS query per field
+            repo_link = None
+            description_elem = None
+            language_elem = None
+            stars_elem = None
+            forks_elem = None
+            avatar_img = None
+            stars_today = 0
+            stars_today_found = False
+            other_links = []
+
+            for elem in article.find_all(_CARD_TAGS):
+                tag = elem.name
+                if tag == 'a':
+                    href = elem.get('href') or ''
+                    if stars_elem is None and href.endswith('/stargazers'):
+                        # Star count (total stars, formatted number like "1,234")
+                        stars_elem = elem
+                    elif forks_elem is None and href.endswith('/network/members'):
+                        forks_elem = elem
+                    else:
+                        other_links.append(elem)
+                elif tag == 'h2':
+                    if repo_link is None:
+                        repo_link = elem.find('a')
+                    if description_elem is None:
+                        # Description is the p element right after h2
+                        sibling = elem.find_next_sibling(True)
+                        if sibling is not None and sibling.name == 'p':
+                            description_elem = sibling
+                elif tag == 'span':
+                    if language_elem is None and elem.get('itemprop') == 'programmingLanguage':
+                        language_elem = elem
+                    elif not stars_today_found and 'float-sm-right' in (elem.get('class') or ()):
+                        # Stars added in the period - right-aligned "1,234 stars today" span
+                        stars_today = self._parse_number(elem.text)
+                        stars_today_found = True
+                elif avatar_img is None and 'avatars' in (elem.get('src') or '') and elem.find_parent('a'):
+                    # Owner avatar - img inside an a element, with src pointing at avatars
+                    avatar_img = elem
+
+            if not stars_today_found:
+                # Fallback for older markup: a link whose text reads "N stars today"
+                for link in other_links:
+                    link_text = link.text.strip().lower()
+                    if 'star' in link_text and 'today' in link_text:
+                        stars_today = self._parse_number(link_text)
+                        break
+
             # Repo name and URL
-            repo_link = article.select_one('h2 a')
             if not repo_link:
                 return None
 
-            # Clean all whitespace in repo name (spaces, newlines, tabs, etc.)
-            full_name = re.sub(r'\s+', '', repo_link.text)
-            html_url = "https://github.com" + repo_link['href']
+            # The link href is already "/owner/repo"; the link text is padded with whitespace
+            href = repo_link['href']
+            full_name = href.strip('/') or _WHITESPACE_RE.sub('', repo_link.text)
+            html_url = "https://github.com" + href
 
-            # Description - use more precise selector
-            # Description is the first p element after h2
-            description_elem = article.select_one('h2 + p')
             description = description_elem.text.strip() if description_elem else None
-
-            # Programming language
-            language_elem = article.select_one('span[itemprop="programmingLanguage"]')
             language = language_elem.text.strip() if language_elem else None
-
-            # Star count (total stars, formatted number like "1,234")
-            stars_elem = article.select_one('a[href$="/stargazers"]')
             stars = self._parse_number(stars_elem.text) if stars_elem else 0
-
-            # Stars added today - link containing "stars today" text
-            stars_today = 0
-            for link in article.select('a'):
-                link_text = link.text.strip().lower()
-                if 'star' in link_text and 'today' in link_text:
-                    stars_today = self._parse_number(link.text)
-                    break
-
-            # Forks
-            forks_elem = article.select_one('a[href$="/network/members"]')
             forks = self._parse_number(forks_elem.text) if forks_elem else 0
 
-            # Owner avatar - find a element containing img, and img src includes avatars
             owner_avatar_url = None
-            avatar_link = article.select_one('a img[src*="avatars"]')
-            if avatar_link:
-                owner_avatar_url = avatar_link.get('src')
+            if avatar_img:
+                owner_avatar_url = avatar_img.get('src')
                 # Remove size parameter from avatar URL to get original size
-                if owner_avatar_url and '&s=' in owner_avatar_url:
-                    owner_avatar_url = owner_avatar_url.split('&s=')[0]
+                if owner_avatar_url:
+                    owner_avatar_url = owner_avatar_url.partition('&s=')[0]
 
-            # Current time
-            now = datetime.now(timezone.utc)
+            if now is None:
+                now = datetime.now(timezone.utc)
 
             # Parse owner and repo name
-            parts = full_name.split('/')
-            owner_login = parts[0] if len(parts) > 1 else ''
-            repo_name = parts[1] if len(parts) > 1 else full_name
+            owner_login, slash, repo_name = full_name.partition('/')
+            if not slash:
+                owner_login, repo_name = '', full_name
 
-            repo = Repository(
+            # Values are already typed by the parser above, so skip Pydantic validation
+            repo = Repository.model_construct(
                 name=repo_name,
                 full_name=full_name,
                 description=description,
@@ -289,13 +613,10 @@ class GitHubTrendingScraper:
                 pushed_at=None,
                 first_seen_at=now,
                 last_seen_at=now,
-                appearance_count=1
+                appearance_count=1,
+                stars_today=stars_today
             )
 
-            # Store stars added today on the object (Pydantic model requires special handling)
-            # Use object.__setattr__ to bypass Pydantic field validation
-            object.__setattr__(repo, 'stars_today', stars_today)
-
             return repo
 
         except Exception as e:
@@ -315,26 +636,15 @@ class GitHubTrendingScraper:
         if not text:
             return 0
 
-        # Remove spaces and unit text
         cleaned = text.replace(',', '').strip()
-        # Remove text like "stars", "today", "forks"
-        for word in ['stars', 'today', 'forks', 'star']:
-            cleaned = cleaned.lower().replace(word, '').strip()
-
-        # Handle k/M/B suffixes
-        multiplier = 1
-        if 'k' in cleaned.lower():
-            multiplier = 1000
-            cleaned = cleaned.lower().replace('k', '')
-        elif 'm' in cleaned.lower():
-            multiplier = 1_000_000
-            cleaned = cleaned.lower().replace('m', '')
-        elif 'b' in cleaned.lower():
-            multiplier = 1_000_000_000
-            cleaned = cleaned.lower().replace('b', '')
+        # Plain counts ("1,234") are the common case and need no regex or float
+        if cleaned.isdecimal():
+            return int(cleaned)
 
-        try:
-            return int(float(cleaned) * multiplier)
-        except (ValueError, TypeError):
+        match = _NUMBER_RE.match(cleaned)
+        if not match:
             logger.warning(f"Failed to parse number: {text!r}")
             return 0
+
+        number, suffix = match.groups()
+        return int(float(number) * _SUFFIX_MULTIPLIERS[suffix and suffix.lower()])
@@ -1,18 +1,21 @@
+import logging
 import os
-import sys
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+from logging.handlers import QueueHandler
 from unittest.mock import MagicMock, patch
 
 import pytest
 
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from src.config import Config, get_config, GitHubConfig, LLMConfig, EmailConfig
+from src.config import Config, get_config, load_yaml_config, GitHubConfig, LLMConfig, EmailConfig
 from src.models import Repository, RepositorySummary, TrendingReport
 from src.fetcher import GitHubFetcher
+from src.readme_cache import ReadmeCache
 from src.filter import RepositoryFilter
 from src.llm import LLMSummarizer
+from src.llm_cache import SummaryCache
 from src.emailer import EmailSender
+from src.scheduler import Scheduler
+from src import logger_config
 
 
 class TestConfig:
@@ -45,6 +48,54 @@ filter:
         assert config.trending.limit == 100
         assert config.filter.days_threshold == 7
 
+    def test_config_cache_invalidated_on_change(self, tmp_path):
+        """Cached config should be reused until the file changes"""
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text("trending:\n  limit: 10\n")
+
+        with patch('src.config.load_yaml_config', wraps=load_yaml_config) as mock_load:
+            first = get_config(str(config_file))
+            second = get_config(str(config_file))
+            assert mock_load.call_count == 1
+            assert first.trending.limit == second.trending.limit == 10
+            assert first is not second
+
+            config_file.write_text("trending:\n  limit: 25\n")
+            os.utime(config_file, ns=(0, config_file.stat().st_mtime_ns + 1_000_000))
+            assert get_config(str(config_file)).trending.limit == 25
+            assert mock_load.call_count == 2
+
+    def test_config_load_validates_without_side_files(self, tmp_path):
+        """Loading should coerce values through Pydantic and write nothing next to the config"""
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text('email:\n  smtp:\n    port: "465"\n')
+
+        config = get_config(str(config_file))
+
+        assert config.email.smtp.port == 465
+        assert [p.name for p in tmp_path.iterdir()] == ["config.yaml"]
+
+    def test_env_var_substitution(self, monkeypatch):
+        """Test ${VAR}, default values and mid-string substitution"""
+        from src.config import _replace_env_vars
+
+        monkeypatch.setenv("GH_TEST_TOKEN", "secret")
+        monkeypatch.delenv("GH_TEST_MISSING", raising=False)
+
+        result = _replace_env_vars({
+            "token": "${GH_TEST_TOKEN}",
+            "items": ["${GH_TEST_MISSING:-\"fallback\"}", "${GH_TEST_MISSING:=other}", "${GH_TEST_MISSING}"],
+            "url": "https://${GH_TEST_TOKEN}@example.com",
+            "port": 465,
+        })
+
+        assert result == {
+            "token": "secret",
+            "items": ["fallback", "other", ""],
+            "url": "https://secret@example.com",
+            "port": 465,
+        }
+
     def test_email_from_address_inference(self):
         """Test automatic inference of from_address from smtp.username"""
         config = Config()
@@ -119,8 +170,6 @@ class TestGitHubFetcher:
     @patch('src.trending_scraper.GitHubTrendingScraper.scrape_trending')
     def test_fetch_trending_repos(self, mock_scrape):
         """Test fetching trending repos by scraping page"""
-        from datetime import datetime, timezone, timezone
-
         mock_repo = Repository(
             name="test-repo",
             full_name="user/test-repo",
@@ -143,6 +192,72 @@ class TestGitHubFetcher:
         assert repos[0].name == "test-repo"
         assert repos[0].stars == 100
 
+    def test_session_mounts_retry_adapter(self):
+        fetcher = GitHubFetcher(Config())
+        retry = fetcher.session.get_adapter("https://api.github.com").max_retries
+
+        assert retry.total == GitHubFetcher.MAX_RETRIES
+        assert 429 in retry.status_forcelist
+        # Permission/abuse 403s never succeed on retry
+        assert 403 not in retry.status_forcelist
+        assert retry.respect_retry_after_header is True
+
+    @patch('requests.Session.get')
+    def test_fetch_repo_readme(self, mock_get, tmp_path):
+        import base64
+
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.headers = {}
+        mock_response.json.return_value = {"content": base64.b64encode(b"# Hello").decode()}
+        mock_get.return_value = mock_response
+
+        fetcher = GitHubFetcher(Config(), readme_cache=ReadmeCache(str(tmp_path)))
+
+        assert fetcher.fetch_repo_readme("user/repo") == "# Hello"
+        assert mock_get.call_args.kwargs["timeout"] == fetcher.config.github.timeout
+
+    @patch('requests.Session.get')
+    def test_fetch_repo_readme_uses_etag_cache(self, mock_get, tmp_path):
+        import base64
+
+        fresh = MagicMock()
+        fresh.status_code = 200
+        fresh.headers = {"ETag": '"abc"'}
+        fresh.json.return_value = {"content": base64.b64encode(b"# Cached").decode()}
+        not_modified = MagicMock()
+        not_modified.status_code = 304
+        mock_get.side_effect = [fresh, not_modified]
+
+        fetcher = GitHubFetcher(Config(), readme_cache=ReadmeCache(str(tmp_path)))
+
+        assert fetcher.fetch_repo_readme("user/repo") == "# Cached"
+        assert mock_get.call_args.kwargs["headers"] is None
+
+        assert fetcher.fetch_repo_readme("user/repo") == "# Cached"
+        assert mock_get.call_args.kwargs["headers"] == {"If-None-Match": '"abc"'}
+        not_modified.json.assert_not_called()
+
+    @patch('src.fetcher.GitHubFetcher.fetch_repo_readme')
+    def test_enrich_repositories_preserves_order(self, mock_readme):
+        mock_readme.side_effect = lambda name: f"README of {name}"
+
+        repos = [
+            Repository(
+                name=f"repo{i}",
+                full_name=f"user/repo{i}",
+                html_url=f"https://github.com/user/repo{i}",
+                owner_login="user"
+            )
+            for i in range(20)
+        ]
+
+        fetcher = GitHubFetcher(Config())
+        enriched = fetcher.enrich_repositories(repos)
+
+        assert [r.full_name for r in enriched] == [r.full_name for r in repos]
+        assert all(r.readme_content == f"README of {r.full_name}" for r in enriched)
+
 
 class TestRepositoryFilter:
     def test_filter_initialization(self, tmp_path):
@@ -152,6 +267,13 @@ class TestRepositoryFilter:
 
         assert filter_obj.db_path == db_path
 
+    def test_engine_uses_wal(self, tmp_path):
+        filter_obj = RepositoryFilter(Config(), db_path=str(tmp_path / "test.db"))
+
+        with filter_obj.engine.connect() as conn:
+            assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+            assert conn.exec_driver_sql("PRAGMA synchronous").scalar() == 1  # NORMAL
+
     def test_is_new_repository(self, tmp_path):
         config = Config()
         db_path = str(tmp_path / "test.db")
@@ -201,6 +323,117 @@ class TestRepositoryFilter:
         )
         assert filter_obj.is_new_repository(new_repo) is True
 
+    def test_is_new_repository_in_batch(self, tmp_path):
+        filter_obj = RepositoryFilter(Config(), db_path=str(tmp_path / "test.db"))
+        seen_at = datetime(2024, 1, 1)
+
+        known = Repository(
+            name="known",
+            full_name="user/known",
+            html_url="https://github.com/user/known",
+            owner_login="user",
+            first_seen_at=seen_at,
+            last_seen_at=seen_at
+        )
+        filter_obj.save_repositories([known])
+
+        unseen = Repository(
+            name="unseen",
+            full_name="user/unseen",
+            html_url="https://github.com/user/unseen",
+            owner_login="user"
+        )
+
+        with filter_obj.begin_batch():
+            with patch.object(filter_obj, '_lookup_one') as mock_lookup:
+                assert filter_obj.is_new_repository(unseen) is True
+                assert filter_obj.is_new_repository(known) is False
+                mock_lookup.assert_not_called()
+
+        assert known.first_seen_at == seen_at
+        assert filter_obj._known is None
+
+    def test_filter_new_repos(self, tmp_path):
+        filter_obj = RepositoryFilter(Config(), db_path=str(tmp_path / "test.db"))
+        seen_at = datetime(2024, 1, 1)
+
+        known = Repository(
+            name="known",
+            full_name="user/known",
+            html_url="https://github.com/user/known",
+            owner_login="user",
+            first_seen_at=seen_at,
+            last_seen_at=seen_at
+        )
+        filter_obj.save_repositories([known])
+
+        fresh_known = Repository(
+            name="known",
+            full_name="user/known",
+            html_url="https://github.com/user/known",
+            owner_login="user"
+        )
+        new_repo = Repository(
+            name="new",
+            full_name="user/new",
+            html_url="https://github.com/user/new",
+            owner_login="user"
+        )
+
+        new_repos = filter_obj.filter_new_repos([fresh_known, new_repo])
+
+        assert [r.full_name for r in new_repos] == ["user/new"]
+        assert fresh_known.first_seen_at == seen_at
+        assert fresh_known.appearance_count == 2
+
+    def test_cleanup_old_records(self, tmp_path):
+        filter_obj = RepositoryFilter(Config(), db_path=str(tmp_path / "test.db"))
+        now = datetime.now()
+
+        repos = [
+            Repository(name=name, full_name=f"user/{name}", html_url=f"https://github.com/user/{name}",
+                       owner_login="user", first_seen_at=seen, last_seen_at=seen)
+            for name, seen in [("old", now - timedelta(days=120)), ("fresh", now)]
+        ]
+        filter_obj.save_repositories(repos)
+
+        assert filter_obj.get_statistics() == {"total_repositories": 2, "new_today": 1}
+        assert filter_obj.cleanup_old_records(days=90) == 1
+        assert [r.full_name for r in filter_obj.get_recent_repos(days=1)] == ["user/fresh"]
+
+    def test_save_repositories_upserts_existing(self, tmp_path):
+        filter_obj = RepositoryFilter(Config(), db_path=str(tmp_path / "test.db"))
+        now = datetime.now(timezone.utc)
+
+        repo = Repository(
+            name="repo1",
+            full_name="user/repo1",
+            html_url="https://github.com/user/repo1",
+            owner_login="user",
+            stars=10,
+            readme_content="# Original",
+            first_seen_at=now,
+            last_seen_at=now
+        )
+        filter_obj.save_repositories([repo])
+
+        repo.stars = 50
+        repo.readme_content = "# Newer"
+        filter_obj.save_repositories([repo])
+
+        saved = filter_obj.get_recent_repos(days=1)
+        assert len(saved) == 1
+        assert saved[0].stars == 50
+        assert saved[0].appearance_count == 2
+        assert saved[0].readme_content == "# Original"
+
+        assert filter_obj.get_recent_repos(days=1, include_readme=False)[0].readme_content is None
+        assert filter_obj.get_recent_repos(days=1, readme_chars=4)[0].readme_content == "# Or"
+        trending = filter_obj.get_trending_repos(limit=5)
+        assert [r.full_name for r in trending] == ["user/repo1"]
+        assert trending[0].readme_content == "# Original"
+        assert filter_obj.get_trending_repos(limit=5, include_readme=False)[0].readme_content is None
+
 
 class TestLLMSummarizer:
     def test_summarizer_initialization(self):
@@ -227,6 +460,144 @@ class TestLLMSummarizer:
         assert "100" in summary
         assert "A test repository" in summary
 
+    def test_summary_cache_skips_repeat_llm_call(self, tmp_path):
+        config = Config()
+        config.llm.summary_prompt = "Summarize {repo_name}: {readme}"
+        summarizer = LLMSummarizer(config, summary_cache=SummaryCache(db_path=str(tmp_path / "cache.db")))
+
+        repo = Repository(
+            name="test-repo",
+            full_name="user/test-repo",
+            description="A test repository",
+            html_url="https://github.com/user/test-repo",
+            stars=100,
+            owner_login="user"
+        )
+
+        with patch.object(summarizer, "_call_llm", return_value="A neat tool.") as mock_call:
+            first = summarizer.summarize_repository(repo)
+            repo.stars = 150
+            second = summarizer.summarize_repository(repo)
+
+        assert "A neat tool." in first
+        assert "A neat tool." in second and "150" in second
+        mock_call.assert_called_once()
+
+        # Batch path: only the uncached repository reaches the LLM
+        other = repo.model_copy(update={"full_name": "user/other", "name": "other"})
+        with patch.object(summarizer, "_call_llm", return_value="Another tool.") as mock_call:
+            summaries = summarizer.summarize_repositories([repo, other])
+
+        assert "A neat tool." in summaries[0]
+        assert "Another tool." in summaries[1]
+        mock_call.assert_called_once()
+
+    def test_summarize_repositories_preserves_order(self, tmp_path):
+        config = Config()
+        config.llm.summary_prompt = "{repo_name}"
+        config.llm.concurrency = 4
+        summarizer = LLMSummarizer(config, summary_cache=SummaryCache(db_path=str(tmp_path / "cache.db")))
+        summarizer._client = MagicMock()
+
+        repos = [
+            Repository(name=f"repo{i}", full_name=f"user/repo{i}",
+                       html_url=f"https://github.com/user/repo{i}", owner_login="user")
+            for i in range(6)
+        ]
+
+        with patch.object(summarizer, "_call_llm", side_effect=lambda prompt: f"About {prompt}"):
+            summaries = summarizer.summarize_repositories(repos)
+
+        assert summaries == [f"About user/repo{i}" for i in range(6)]
+
+    def test_build_summary_prompt_matches_str_format(self):
+        config = Config()
+        repo = Repository(name="repo", full_name="user/repo", html_url="https://github.com/user/repo",
+                          owner_login="user", stars=42)
+
+        for template in ["{repo_name} ({language}) {{braces}} {stars}\n{readme}", "{repo_name} {stars:>6}"]:
+            config.llm.summary_prompt = template
+            summarizer = LLMSummarizer(config)
+            expected = template.format(repo_name="user/repo", description="No description", language="Unknown",
+                                       stars=42, readme=summarizer._build_context(repo))
+            assert summarizer._build_summary_prompt(repo) == expected
+
+    def test_parse_response_skips_headings_and_blank_lines(self):
+        summarizer = LLMSummarizer(Config())
+
+        assert summarizer._parse_response("# Summary\n\n  A fast tool.  \nMore text") == "A fast tool."
+        assert summarizer._parse_response("#only\n#headings here") == "#only\n#headings here"
+
+    def test_summarize_repositories_in_batches(self, tmp_path):
+        config = Config()
+        config.llm.batch_size = 3
+        summarizer = LLMSummarizer(config, summary_cache=SummaryCache(db_path=str(tmp_path / "cache.db")))
+        summarizer._client = MagicMock()
+
+        repos = [
+            Repository(name=f"repo{i}", full_name=f"user/repo{i}",
+                       html_url=f"https://github.com/user/repo{i}", owner_login="user")
+            for i in range(3)
+        ]
+        # Index 3 is missing from the batched reply, so that repository is retried on its own
+        batch_reply = 'Here you go:\n```json\n[{"index": 2, "summary": "Second."}, {"index": 1, "summary": "First."}]\n```'
+
+        with patch.object(summarizer, "_call_llm", side_effect=[batch_reply, "Third."]) as mock_call:
+            summaries = summarizer.summarize_repositories(repos)
+
+        assert summaries == ["First.", "Second.", "Third."]
+        assert mock_call.call_count == 2
+        assert "Repo 3: user/repo2" in mock_call.call_args_list[0].args[0]
+
+    def test_batch_attempts_are_capped(self, tmp_path):
+        """A rate-limited batch must not fan out into fully-retried per-repo calls"""
+        config = Config()
+        config.llm.batch_size = 3
+        summarizer = LLMSummarizer(config, summary_cache=SummaryCache(db_path=str(tmp_path / "cache.db")))
+        repos = [
+            Repository(name=f"repo{i}", full_name=f"user/repo{i}", html_url=f"https://github.com/user/repo{i}",
+                       owner_login="user")
+            for i in range(3)
+        ]
+        rate_limited = Exception("rate limited")
+        rate_limited.status_code = 429
+
+        with patch.object(summarizer, "_call_llm", side_effect=rate_limited) as mock_call, \
+                patch("src.llm.time.sleep"):
+            summarizer.summarize_repositories(repos)
+        assert mock_call.call_count == summarizer.MAX_RETRIES + 1
+
+        # A malformed reply falls back to one attempt per repository
+        with patch.object(summarizer, "_call_llm", side_effect=["not json", rate_limited, rate_limited,
+                                                                 rate_limited]) as mock_call, \
+                patch("src.llm.time.sleep") as mock_sleep:
+            summarizer.summarize_repositories(repos)
+        assert mock_call.call_count == 1 + len(repos)
+        mock_sleep.assert_not_called()
+
+    def test_sdk_client_retries_disabled(self):
+        """SDK retries are off so they don't stack with _call_llm_with_backoff"""
+        config = Config()
+        config.llm.provider = "openai"
+        fake_openai = MagicMock()
+
+        with patch.dict("sys.modules", {"openai": fake_openai}):
+            LLMSummarizer(config).client
+
+        assert fake_openai.OpenAI.call_args.kwargs["max_retries"] == 0
+
+    def test_call_llm_retries_rate_limit(self):
+        summarizer = LLMSummarizer(Config())
+        rate_limited = Exception("rate limited")
+        rate_limited.status_code = 429
+
+        with patch.object(summarizer, "_call_llm", side_effect=[rate_limited, "ok"]) as mock_call, \
+                patch("src.llm.time.sleep") as mock_sleep:
+            assert summarizer._call_llm_with_backoff("prompt") == "ok"
+
+        assert mock_call.call_count == 2
+        mock_sleep.assert_called_once()
+
 
 class TestEmailSender:
     def test_email_sender_initialization(self):
@@ -295,6 +666,139 @@ class TestEmailSender:
         assert "<html>" in html
         assert "test-repo" in html
 
+    def test_generate_html_report_escapes_fields(self):
+        config = Config()
+        emailer = EmailSender(config)
+
+        repo = Repository(
+            name="test-repo",
+            full_name="user/test-repo",
+            html_url="https://github.com/user/test-repo",
+            language="C<script>",
+            owner_login="user"
+        )
+        report = TrendingReport(
+            generated_at=datetime.now(),
+            period="daily",
+            language="",
+            new_repos_count=1,
+            total_repos_count=1,
+            repositories=[RepositorySummary(repository=repo, summary="a < b\n---\nline1\nline2")]
+        )
+
+        html = emailer._generate_html_report(report)
+        assert "C&lt;script&gt;" in html
+        assert "<script>" not in html
+        assert "a &lt; b<hr" in html
+        assert "line1<br>line2" in html
+
+    def test_save_json_report_round_trip(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        emailer = EmailSender(Config())
+
+        report = TrendingReport(
+            generated_at=datetime(2024, 1, 2, 3, 4, 5),
+            period="daily",
+            language="Python",
+            new_repos_count=0,
+            total_repos_count=0,
+            repositories=[]
+        )
+        emailer._save_json_report(report)
+
+        saved = tmp_path / "data" / "reports" / "trending_report_20240102_030405.json"
+        assert TrendingReport.model_validate_json(saved.read_text(encoding='utf-8')) == report
+
+    @patch('src.emailer.smtplib.SMTP')
+    def test_send_report_reuses_smtp_connection(self, mock_smtp, tmp_path, monkeypatch):
+        """A single SMTP session should serve every recipient"""
+        monkeypatch.chdir(tmp_path)
+        config = Config()
+        config.email.to_addresses = ["a@example.com", "b@example.com", "c@example.com"]
+        emailer = EmailSender(config)
+
+        report = TrendingReport(
+            generated_at=datetime.now(),
+            period="daily",
+            language="Python",
+            new_repos_count=0,
+            total_repos_count=0,
+            repositories=[]
+        )
+
+        assert emailer.send_report(report) is True
+
+        server = mock_smtp.return_value
+        assert mock_smtp.call_count == 1
+        assert server.login.call_count == 1
+        sent_to = [c.args[1] for c in server.sendmail.call_args_list]
+        assert sent_to == [["a@example.com"], ["b@example.com"], ["c@example.com"]]
+
+        # Body is identical for everyone, only the To: header changes
+        messages = [c.args[2] for c in server.sendmail.call_args_list]
+        assert messages[1].startswith(b"To: b@example.com\r\n")
+        assert messages[0].split(b"\r\n", 1)[1] == messages[2].split(b"\r\n", 1)[1]
+
+    @patch('src.emailer.smtplib.SMTP')
+    def test_smtp_error_resets_connection_and_continues(self, mock_smtp):
+        """An SMTP error for one recipient should not leave later recipients on a dead session"""
+        import smtplib
+
+        config = Config()
+        config.email.to_addresses = ["a@example.com", "b@example.com"]
+        emailer = EmailSender(config)
+        server = mock_smtp.return_value
+        server.sendmail.side_effect = [smtplib.SMTPDataError(451, b"Try again later"), {}]
+
+        assert emailer.send_content("Subject", "<p>x</p>", "x") is False
+
+        assert mock_smtp.call_count == 2
+        assert [c.args[1] for c in server.sendmail.call_args_list] == [["a@example.com"], ["b@example.com"]]
+
+    @patch('src.emailer.smtplib.SMTP')
+    def test_send_content_non_ascii_headers(self, mock_smtp):
+        """Non-ASCII Subject and From display names should be RFC 2047-encoded, not crash"""
+        config = Config()
+        config.email.from_address = "热门日报 <bot@example.com>"
+        config.email.to_addresses = ["a@example.com"]
+        emailer = EmailSender(config)
+
+        assert emailer.send_content("GitHub 热门项目日报", "<p>正文</p>", "正文") is True
+
+        data = mock_smtp.return_value.sendmail.call_args.args[2]
+        assert mock_smtp.return_value.sendmail.call_args.args[0] == "bot@example.com"
+        headers = data.split(b"\r\n\r\n", 1)[0]
+        assert b"Subject: GitHub =?utf-8?" in headers
+        assert b"From: =?utf-8?" in headers
+        headers.decode("ascii")
+
+    @patch('src.emailer.smtplib.SMTP')
+    def test_send_report_bulk_single_transaction(self, mock_smtp, tmp_path, monkeypatch):
+        """BCC mode should upload the message once for all recipients"""
+        monkeypatch.chdir(tmp_path)
+        config = Config()
+        config.email.to_addresses = ["a@example.com", "b@example.com"]
+        emailer = EmailSender(config)
+
+        server = mock_smtp.return_value
+        server.send_message.return_value = {"b@example.com": (550, b"No such user")}
+
+        report = TrendingReport(
+            generated_at=datetime.now(),
+            period="daily",
+            language="Python",
+            new_repos_count=0,
+            total_repos_count=0,
+            repositories=[]
+        )
+
+        assert emailer.send_report_bulk(report) is False
+
+        assert server.send_message.call_count == 1
+        msg = server.send_message.call_args.args[0]
+        assert msg["To"] == "undisclosed-recipients:;"
+        assert server.send_message.call_args.kwargs["to_addrs"] == ["a@example.com", "b@example.com"]
+
 
 class TestTrendingReport:
     def test_report_creation(self):
@@ -312,5 +816,51 @@ class TestTrendingReport:
         assert report.new_repos_count == 5
 
 
+class TestScheduler:
+    @patch('src.llm.LLMSummarizer.prepare')
+    @patch('src.llm.LLMSummarizer.summarize_repository')
+    @patch('src.fetcher.GitHubFetcher.fetch_repo_readme')
+    @patch('src.scheduler.RepositoryFilter')
+    def test_pipeline_summarizes_as_readmes_arrive(self, mock_filter_cls, mock_readme, mock_summarize, mock_prepare):
+        repos = [
+            Repository(name=f"repo{i}", full_name=f"user/repo{i}",
+                       html_url=f"https://github.com/user/repo{i}", owner_login="user")
+            for i in range(5)
+        ]
+        mock_filter_cls.return_value.filter_new_repos.return_value = repos
+        mock_readme.side_effect = lambda name: f"README of {name}"
+        mock_summarize.side_effect = lambda repo: f"Summary from {repo.readme_content}"
+
+        scheduler = Scheduler(Config())
+        with patch.object(scheduler.fetcher, "fetch_trending_repos", return_value=repos), \
+                patch.object(scheduler.emailer, "send_report") as mock_send:
+            report = scheduler.run_once()
+
+        assert [s.repository.full_name for s in report.repositories] == [r.full_name for r in repos]
+        assert [s.summary for s in report.repositories] == [f"Summary from README of {r.full_name}" for r in repos]
+        mock_filter_cls.return_value.save_repositories.assert_called_once_with(repos)
+        mock_send.assert_called_once_with(report)
+
+
+class TestLogging:
+    def test_setup_logging_twice_keeps_single_listener(self, tmp_path):
+        root_logger = logging.getLogger()
+        saved_handlers, saved_level = root_logger.handlers[:], root_logger.level
+        try:
+            logger_config.setup_logging(log_dir=str(tmp_path))
+            first = logger_config._listener
+            logger_config.setup_logging(log_dir=str(tmp_path))
+
+            assert first._thread is None
+            assert all(h.stream is None for h in first.handlers if isinstance(h, logging.FileHandler))
+            assert len(root_logger.handlers) == 1
+            assert isinstance(root_logger.handlers[0], QueueHandler)
+            assert root_logger.handlers[0].queue is logger_config._listener.queue
+        finally:
+            logger_config._stop_listener()
+            root_logger.handlers[:] = saved_handlers
+            root_logger.setLevel(saved_level)
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -1,71 +1,96 @@
 """Tests for GitHubTrendingScraper module"""
 
-import os
-import sys
+import asyncio
+import time
 from datetime import datetime, timezone
 from unittest.mock import MagicMock, patch
 
+import httpx
 import pytest
+import requests
 from bs4 import BeautifulSoup
 
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from src.trending_scraper import GitHubTrendingScraper
+from src.trending_scraper import GitHubTrendingScraper, _HTML_PARSER, _TRENDING_ARTICLES
 from src.models import Repository
+from src.readme_cache import ResponseCache
+
+
+def _repo(name: str, owner: str = "user") -> Repository:
+    """Fresh, not yet enriched repository for API enrichment tests"""
+    return Repository(name=name, full_name=f"{owner}/{name}", html_url=f"https://github.com/{owner}/{name}",
+                      owner_login=owner)
+
+
+def _graphql_response(data: dict) -> MagicMock:
+    """Mocked session.post response carrying a GraphQL data map"""
+    response = MagicMock()
+    response.json.return_value = {"data": data}
+    return response
+
+
+@pytest.fixture(scope="module")
+def scraper():
+    """One scraper for the tests that only call its parsing helpers"""
+    return GitHubTrendingScraper()
+
+
+@pytest.fixture(scope="module")
+def parse_article():
+    """Parse a card fixture the way the scraper does: same backend, only <article> elements built"""
+    return lambda html: BeautifulSoup(html, _HTML_PARSER, parse_only=_TRENDING_ARTICLES).find("article")
 
 
 class TestParseNumber:
     """Test number parsing functionality"""
 
-    def setup_method(self):
-        self.scraper = GitHubTrendingScraper()
-
-    def test_parse_simple_number(self):
+    @pytest.mark.parametrize("text,expected", [("1234", 1234), ("1,234", 1234), ("12,345", 12345)])
+    def test_parse_simple_number(self, scraper, text, expected):
         """Test simple numbers"""
-        assert self.scraper._parse_number("1234") == 1234
-        assert self.scraper._parse_number("1,234") == 1234
-        assert self.scraper._parse_number("12,345") == 12345
+        assert scraper._parse_number(text) == expected
+
+    def test_plain_count_skips_regex(self, scraper, monkeypatch):
+        """Test digit-only counts are parsed without the suffix regex"""
+        number_re = MagicMock()
+        monkeypatch.setattr("src.trending_scraper._NUMBER_RE", number_re)
+        assert scraper._parse_number("\n  12,345\n") == 12345
+        number_re.match.assert_not_called()
 
-    def test_parse_k_suffix(self):
+    @pytest.mark.parametrize("text,expected", [("5k", 5000), ("5.2k", 5200), ("1.5k", 1500), ("0.5k", 500)])
+    def test_parse_k_suffix(self, scraper, text, expected):
         """Test k suffix"""
-        assert self.scraper._parse_number("5k") == 5000
-        assert self.scraper._parse_number("5.2k") == 5200
-        assert self.scraper._parse_number("1.5k") == 1500
-        assert self.scraper._parse_number("0.5k") == 500
+        assert scraper._parse_number(text) == expected
 
-    def test_parse_m_suffix(self):
+    @pytest.mark.parametrize("text,expected", [("1M", 1_000_000), ("1.5M", 1_500_000), ("0.5M", 500_000)])
+    def test_parse_m_suffix(self, scraper, text, expected):
         """Test M suffix"""
-        assert self.scraper._parse_number("1M") == 1_000_000
-        assert self.scraper._parse_number("1.5M") == 1_500_000
-        assert self.scraper._parse_number("0.5M") == 500_000
+        assert scraper._parse_number(text) == expected
 
-    def test_parse_b_suffix(self):
+    @pytest.mark.parametrize("text,expected", [("1B", 1_000_000_000), ("2.5B", 2_500_000_000)])
+    def test_parse_b_suffix(self, scraper, text, expected):
         """Test B suffix"""
-        assert self.scraper._parse_number("1B") == 1_000_000_000
-        assert self.scraper._parse_number("2.5B") == 2_500_000_000
-
-    def test_parse_with_text(self):
+        assert scraper._parse_number(text) == expected
+
+    @pytest.mark.parametrize("text,expected", [
+        ("1234 stars", 1234),
+        ("5.2k stars", 5200),
+        ("234 stars today", 234),
+        ("1.5k forks", 1500),
+        ("12 stars this week", 12),
+    ])
+    def test_parse_with_text(self, scraper, text, expected):
         """Test numbers with text"""
-        assert self.scraper._parse_number("1234 stars") == 1234
-        assert self.scraper._parse_number("5.2k stars") == 5200
-        assert self.scraper._parse_number("234 stars today") == 234
-        assert self.scraper._parse_number("1.5k forks") == 1500
+        assert scraper._parse_number(text) == expected
 
-    def test_parse_empty_and_invalid(self):
+    @pytest.mark.parametrize("text", ["", None, "invalid", "N/A"])
+    def test_parse_empty_and_invalid(self, scraper, text):
         """Test empty and invalid values"""
-        assert self.scraper._parse_number("") == 0
-        assert self.scraper._parse_number(None) == 0
-        assert self.scraper._parse_number("invalid") == 0
-        assert self.scraper._parse_number("N/A") == 0
+        assert scraper._parse_number(text) == 0
 
 
 class TestParseRepoArticle:
     """Test repository HTML parsing"""
 
-    def setup_method(self):
-        self.scraper = GitHubTrendingScraper()
-
-    def test_parse_basic_repo(self):
+    def test_parse_basic_repo(self, scraper, parse_article):
         """Test basic repository parsing"""
         html = """
         <article class="Box-row">
@@ -85,10 +110,9 @@ class TestParseRepoArticle:
             </a>
         </article>
         """
-        soup = BeautifulSoup(html, 'html.parser')
-        article = soup.select_one('article.Box-row')
+        article = parse_article(html)
 
-        repo = self.scraper._parse_repo_article(article)
+        repo = scraper._parse_repo_article(article)
 
         assert repo is not None
         assert repo.name == "repo"
@@ -100,7 +124,7 @@ class TestParseRepoArticle:
         assert repo.owner_login == "user"
         assert repo.owner_avatar_url is not None
 
-    def test_parse_repo_with_stars_today(self):
+    def test_parse_repo_with_stars_today(self, scraper, parse_article):
         """Test parsing with stars today count"""
         html = """
         <article class="Box-row">
@@ -116,16 +140,33 @@ class TestParseRepoArticle:
             </div>
         </article>
         """
-        soup = BeautifulSoup(html, 'html.parser')
-        article = soup.select_one('article.Box-row')
+        article = parse_article(html)
 
-        repo = self.scraper._parse_repo_article(article)
+        repo = scraper._parse_repo_article(article)
 
         assert repo is not None
         assert repo.stars == 5000
         assert repo.stars_today == 123
 
-    def test_parse_repo_with_k_stars(self):
+    def test_parse_stars_today_span(self, scraper, parse_article):
+        """Test stars today read from the right-aligned span used by current markup"""
+        html = """
+        <article class="Box-row">
+            <h2><a href="/user/repo">user/repo</a></h2>
+            <div>
+                <a href="/user/repo/stargazers">5,000</a>
+                <a href="/user/repo/network/members">200</a>
+                <span class="d-inline-block float-sm-right">1,024 stars today</span>
+            </div>
+        </article>
+        """
+        article = parse_article(html)
+
+        repo = scraper._parse_repo_article(article)
+
+        assert repo.stars_today == 1024
+
+    def test_parse_repo_with_k_stars(self, scraper, parse_article):
         """Test stars with k suffix"""
         html = """
         <article class="Box-row">
@@ -141,16 +182,15 @@ class TestParseRepoArticle:
             </div>
         </article>
         """
-        soup = BeautifulSoup(html, 'html.parser')
-        article = soup.select_one('article.Box-row')
+        article = parse_article(html)
 
-        repo = self.scraper._parse_repo_article(article)
+        repo = scraper._parse_repo_article(article)
 
         assert repo is not None
         assert repo.stars == 5200
         assert repo.stars_today == 1200
 
-    def test_parse_repo_without_language(self):
+    def test_parse_repo_without_language(self, scraper, parse_article):
         """Test repository without language"""
         html = """
         <article class="Box-row">
@@ -164,15 +204,14 @@ class TestParseRepoArticle:
             </div>
         </article>
         """
-        soup = BeautifulSoup(html, 'html.parser')
-        article = soup.select_one('article.Box-row')
+        article = parse_article(html)
 
-        repo = self.scraper._parse_repo_article(article)
+        repo = scraper._parse_repo_article(article)
 
         assert repo is not None
         assert repo.language is None
 
-    def test_parse_repo_without_description(self):
+    def test_parse_repo_without_description(self, scraper, parse_article):
         """Test repository without description"""
         html = """
         <article class="Box-row">
@@ -185,21 +224,19 @@ class TestParseRepoArticle:
             </div>
         </article>
         """
-        soup = BeautifulSoup(html, 'html.parser')
-        article = soup.select_one('article.Box-row')
+        article = parse_article(html)
 
-        repo = self.scraper._parse_repo_article(article)
+        repo = scraper._parse_repo_article(article)
 
         assert repo is not None
         assert repo.description is None
 
-    def test_parse_invalid_article(self):
+    def test_parse_invalid_article(self, scraper, parse_article):
         """Test invalid article element"""
         html = '<article class="Box-row"><p>No content</p></article>'
-        soup = BeautifulSoup(html, 'html.parser')
-        article = soup.select_one('article.Box-row')
+        article = parse_article(html)
 
-        repo = self.scraper._parse_repo_article(article)
+        repo = scraper._parse_repo_article(article)
 
         assert repo is None
 
@@ -258,24 +295,273 @@ class TestFetchWithRetry:
         assert "Success" in str(soup)
         assert mock_get.call_count == 3
 
+    @patch('requests.Session.get')
+    @patch('src.trending_scraper.time.sleep')
+    def test_client_error_fails_fast(self, mock_sleep, mock_get):
+        """Test 4xx responses other than 429 are not retried"""
+        import requests
+        mock_response = MagicMock()
+        mock_response.status_code = 404
+        mock_response.raise_for_status.side_effect = requests.exceptions.HTTPError("404", response=mock_response)
+        mock_get.return_value = mock_response
 
-class TestGetSinceParam:
-    """Test since parameter conversion"""
+        assert self.scraper._fetch_with_retry("https://example.com") is None
+        assert mock_get.call_count == 1
+        mock_sleep.assert_not_called()
+
+    @patch('requests.Session.get')
+    @patch('src.trending_scraper.time.sleep')
+    def test_rate_limit_honors_retry_after(self, mock_sleep, mock_get):
+        """Test a 429 waits for Retry-After before retrying"""
+        import requests
+        limited = MagicMock()
+        limited.status_code = 429
+        limited.headers = {"Retry-After": "7"}
+        limited.raise_for_status.side_effect = requests.exceptions.HTTPError("429", response=limited)
+        ok = MagicMock()
+        ok.text = "<html><body>Success</body></html>"
+        mock_get.side_effect = [limited, ok]
+
+        soup = self.scraper._fetch_with_retry("https://example.com")
+
+        assert "Success" in str(soup)
+        mock_sleep.assert_called_once_with(7.0)
+
+    @patch('requests.Session.get')
+    def test_not_modified_uses_cached_page(self, mock_get, tmp_path):
+        """Test a 304 response is served from the ETag cache"""
+        cache = ResponseCache(cache_dir=str(tmp_path))
+        cache.put("https://example.com", '"v1"', "<html><body>Cached</body></html>")
+        scraper = GitHubTrendingScraper(response_cache=cache)
+
+        mock_response = MagicMock()
+        mock_response.status_code = 304
+        mock_get.return_value = mock_response
+
+        soup = scraper._fetch_with_retry("https://example.com")
+
+        assert "Cached" in str(soup)
+        assert mock_get.call_args.kwargs["headers"] == {"If-None-Match": '"v1"'}
+
+    @patch('requests.Session.get')
+    def test_not_modified_since_without_etag(self, mock_get, tmp_path):
+        """Test pages cached without an ETag are revalidated with If-Modified-Since"""
+        cache = ResponseCache(cache_dir=str(tmp_path))
+        cache.put("https://example.com", "", "<html><body>Cached</body></html>")
+        scraper = GitHubTrendingScraper(response_cache=cache)
+
+        mock_response = MagicMock()
+        mock_response.status_code = 304
+        mock_get.return_value = mock_response
+
+        soup = scraper._fetch_with_retry("https://example.com")
+
+        assert "Cached" in str(soup)
+        assert mock_get.call_args.kwargs["headers"]["If-Modified-Since"].endswith(" GMT")
+
+
+class TestEnrichFromApi:
+    """Test concurrent GitHub API enrichment"""
 
     def setup_method(self):
         self.scraper = GitHubTrendingScraper()
 
-    def test_daily_period(self):
-        assert self.scraper._get_since_param("daily") == "daily"
+    def test_enrich_preserves_order_and_keeps_failures(self):
+        """Test enriched repos keep input order and failed lookups keep original data"""
+        def handler(request):
+            assert request.headers["Authorization"] == "token test-token"
+            if request.url.path.endswith("/missing"):
+                return httpx.Response(404)
+            return httpx.Response(200, json={
+                "created_at": "2024-01-01T00:00:00Z",
+                "open_issues_count": 7,
+                "owner": {"avatar_url": "https://avatars.example/u"}
+            })
+
+        repos = [_repo(name) for name in ["first", "missing", "last"]]
+
+        enriched = asyncio.run(self.scraper._enrich_repos_async(
+            repos, "test-token", transport=httpx.MockTransport(handler)
+        ))
+
+        assert [r.full_name for r in enriched] == ["user/first", "user/missing", "user/last"]
+        assert enriched[0].open_issues == 7
+        assert enriched[0].created_at == datetime(2024, 1, 1, tzinfo=timezone.utc)
+        assert enriched[1].open_issues == 0
+        assert enriched[2].owner_avatar_url == "https://avatars.example/u"
+
+    def test_enrich_revalidates_with_etag(self, tmp_path):
+        """Test cached API payloads are sent as If-None-Match and reused on 304"""
+        self.scraper.response_cache = ResponseCache(cache_dir=str(tmp_path))
+        requests_seen = []
+
+        def handler(request):
+            requests_seen.append(request.headers.get("If-None-Match"))
+            if request.headers.get("If-None-Match") == '"v1"':
+                return httpx.Response(304)
+            return httpx.Response(200, headers={"ETag": '"v1"'}, json={"open_issues_count": 3})
+
+        transport = httpx.MockTransport(handler)
+        asyncio.run(self.scraper._enrich_repos_async([_repo("repo")], "tok", transport=transport))
+        enriched = asyncio.run(self.scraper._enrich_repos_async([_repo("repo")], "tok", transport=transport))
+
+        assert requests_seen == [None, '"v1"']
+        assert enriched[0].open_issues == 3
+
+    @patch('src.trending_scraper.asyncio.sleep')
+    def test_low_rate_limit_pauses_requests(self, mock_sleep):
+        """Test requests after a low X-RateLimit-Remaining wait for the reset time"""
+        def handler(request):
+            return httpx.Response(200, json={}, headers={
+                "X-RateLimit-Remaining": "3",
+                "X-RateLimit-Reset": str(int(time.time()) + 30)
+            })
+
+        repos = [_repo(name) for name in ["first", "second"]]
+        self.scraper.API_MAX_CONCURRENCY = 1
+        asyncio.run(self.scraper._enrich_repos_async(repos, "tok", transport=httpx.MockTransport(handler)))
+
+        mock_sleep.assert_awaited_once()
+        assert 0 < mock_sleep.await_args.args[0] <= self.scraper.RATE_LIMIT_MAX_WAIT
+
+    def test_graphql_batch_with_rest_fallback(self):
+        """Test one GraphQL query enriches resolved repos and unresolved ones fall back to REST"""
+        graphql_response = _graphql_response({
+            "r0": {
+                "createdAt": "2024-01-01T00:00:00Z",
+                "openIssues": {"totalCount": 4},
+                "openPullRequests": {"totalCount": 2},
+                "owner": {"avatarUrl": "https://avatars.example/u"}
+            },
+            "r1": None
+        })
+        repos = [_repo(name) for name in ["found", "renamed"]]
+
+        with patch.object(self.scraper.session, 'post', return_value=graphql_response) as mock_post, \
+                patch.object(self.scraper, '_enrich_repos_async', new=MagicMock()) as mock_rest, \
+                patch('src.trending_scraper.asyncio.run'):
+            enriched = self.scraper._enrich_repos_from_api_batch(repos, "tok")
+
+        assert mock_post.call_count == 1
+        assert 'r1: repository(owner: "user", name: "renamed")' in mock_post.call_args.kwargs["json"]["query"]
+        assert enriched is repos
+        assert repos[0].open_issues == 6
+        assert repos[0].created_at == datetime(2024, 1, 1, tzinfo=timezone.utc)
+        assert repos[0].owner_avatar_url == "https://avatars.example/u"
+        mock_rest.assert_called_once_with([repos[1]], "tok")
+
+    def test_rest_fallback_from_running_event_loop(self):
+        """Test the sync enrichment entry point also works when called inside a running loop"""
+        rest_calls = []
+
+        async def fake_rest(repos, token):
+            rest_calls.append([r.full_name for r in repos])
+            return repos
+
+        async def caller():
+            return self.scraper._enrich_repos_from_api_batch([_repo("repo")], "tok")
+
+        with patch.object(self.scraper.session, 'post', side_effect=requests.exceptions.ConnectionError), \
+                patch.object(self.scraper, '_enrich_repos_async', new=fake_rest):
+            enriched = asyncio.run(caller())
+
+        assert [r.full_name for r in enriched] == ["user/repo"]
+        assert rest_calls == [["user/repo"]]
+
+    def test_fresh_cached_payload_skips_api(self, tmp_path):
+        """Test payloads cached within API_CACHE_TTL are applied without any request"""
+        self.scraper.response_cache = ResponseCache(cache_dir=str(tmp_path))
+        self.scraper.response_cache.put("api:user/repo", "", '{"open_issues_count": 5}')
+        repo = _repo("repo")
+
+        with patch.object(self.scraper.session, 'post') as mock_post:
+            self.scraper._enrich_repos_from_api_batch([repo], "tok")
+
+        mock_post.assert_not_called()
+        assert repo.open_issues == 5
+
+    def test_graphql_enriches_every_resolved_repo(self, tmp_path):
+        """Test all resolved aliases in a batch are applied and cached, not just the first"""
+        self.scraper.response_cache = ResponseCache(cache_dir=str(tmp_path))
+        graphql_response = _graphql_response({
+            f"r{i}": {"openIssues": {"totalCount": i + 1}, "owner": {}} for i in range(3)
+        })
+        repos = [_repo(f"r{i}", owner="o") for i in range(3)]
+
+        with patch.object(self.scraper.session, 'post', return_value=graphql_response):
+            remaining = self.scraper._enrich_repos_via_graphql(repos, "tok")
+
+        assert remaining == []
+        assert [r.open_issues for r in repos] == [1, 2, 3]
+        assert self.scraper.response_cache.get("api:o/r2") is not None
+
+
+class TestScrapeTrending:
+    """Test full page scraping"""
+
+    def setup_method(self):
+        self.scraper = GitHubTrendingScraper()
+
+    def test_scrape_parses_all_articles(self):
+        """Test every repository card is parsed when only articles are built into the tree"""
+        mock_response = MagicMock()
+        mock_response.text = """
+        <html><head><title>Trending</title></head><body><header><a href="/login">Sign in</a></header>
+        <div class="Box">
+          <article class="Box-row">
+            <h2 class="h3"><a href="/owner/first">owner / first</a></h2>
+            <p class="col-9">First repo</p>
+            <div><a href="/owner/first/stargazers">1,234</a></div>
+          </article>
+          <article class="Box-row">
+            <h2 class="h3"><a href="/owner/second">owner / second</a></h2>
+          </article>
+        </div></body></html>
+        """
+        mock_response.raise_for_status = MagicMock()
+
+        with patch.object(self.scraper.session, 'get', return_value=mock_response):
+            repos = self.scraper.scrape_trending()
+
+        assert [r.full_name for r in repos] == ["owner/first", "owner/second"]
+        assert repos[0].description == "First repo"
+        assert repos[0].stars == 1234
+        assert repos[0].first_seen_at == repos[1].first_seen_at
+
+    def test_scrape_many_keeps_spec_order(self):
+        """Test pages fetched concurrently come back in spec order, with failed pages empty"""
+        pages = {
+            "https://github.com/trending?since=daily": "one",
+            "https://github.com/trending/python?since=weekly": "two",
+        }
 
-    def test_weekly_period(self):
-        assert self.scraper._get_since_param("weekly") == "weekly"
+        def fake_fetch(url, timeout=15, parse_only=None):
+            if url not in pages:
+                return None
+            return BeautifulSoup(
+                f'<article class="Box-row"><h2><a href="/owner/{pages[url]}">owner / {pages[url]}</a></h2></article>',
+                _HTML_PARSER
+            )
 
-    def test_monthly_period(self):
-        assert self.scraper._get_since_param("monthly") == "monthly"
+        with patch.object(self.scraper, '_fetch_with_retry', side_effect=fake_fetch):
+            results = self.scraper.scrape_many([
+                ("daily", "", 10), ("weekly", "python", 10), ("monthly", "rust", 10)
+            ])
 
-    def test_invalid_period(self):
-        assert self.scraper._get_since_param("invalid") == "daily"
+        assert [[r.full_name for r in repos] for repos in results] == [["owner/one"], ["owner/two"], []]
+
+
+class TestGetSinceParam:
+    """Test since parameter conversion"""
+
+    @pytest.mark.parametrize("period,expected", [
+        ("daily", "daily"),
+        ("weekly", "weekly"),
+        ("monthly", "monthly"),
+        ("invalid", "daily"),
+    ])
+    def test_since_param(self, scraper, period, expected):
+        assert scraper._get_since_param(period) == expected
 
 
 class TestInitialization:
@@ -290,6 +576,10 @@ class TestInitialization:
         scraper = GitHubTrendingScraper(max_retries=5)
         assert scraper.max_retries == 5
 
+    def test_instances_own_their_session(self):
+        """Test each scraper has its own session, so closing one leaves others usable"""
+        assert GitHubTrendingScraper().session is not GitHubTrendingScraper().session
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])